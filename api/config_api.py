@@ -20,7 +20,7 @@ along with ss_translator.  If not, see <https://www.gnu.org/licenses/>.
 配置管理相关的 API 接口
 """
 from flask import Blueprint, request, jsonify
-from config_manager import config_manager
+from config_manager import get_config_manager
 import global_values
 
 
@@ -29,7 +29,7 @@ config_bp = Blueprint('config', __name__)
 @config_bp.route('/api/configs')
 def api_configs():
     """获取所有可用的配置"""
-    configs = config_manager.get_available_configs()
+    configs = get_config_manager().get_available_configs()
     return jsonify(configs)
 
 @config_bp.route('/api/configs/current')
@@ -38,7 +38,7 @@ def api_current_config():
     
     if global_values.current_config_name:
         try:
-            config = config_manager.load_config(global_values.current_config_name)
+            config = get_config_manager().load_config(global_values.current_config_name)
             return jsonify({
                 "success": True,
                 "config_name": global_values.current_config_name,
@@ -80,7 +80,7 @@ def api_save_config():
     if not config_data:
         return jsonify({"success": False, "message": "配置数据不能为空"})
     config_data.pop('api_key', None)  # 确保不保存 api key 等敏感信息
-    success = config_manager.save_config(config_name, config_data)
+    success = get_config_manager().save_config(config_name, config_data)
     return jsonify({
         "success": success,
         "message": "保存成功" if success else "保存失败"
@@ -100,7 +100,7 @@ def api_create_config():
     max_tokens = data.get('max_tokens', 2000)
     
     try:
-        config_data = config_manager.create_new_config(config_name, mod_name, mod_path, description, temperature, max_tokens)
+        config_data = get_config_manager().create_new_config(config_name, mod_name, mod_path, description, temperature, max_tokens)
         return jsonify({"success": True, "message": "创建成功", "config": config_data})
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
@@ -113,7 +113,7 @@ def api_delete_config():
         return jsonify({"success": False, "message": "无效的配置数据"})
     config_name = data.get('config_name')
     
-    success = config_manager.delete_config(config_name)
+    success = get_config_manager().delete_config(config_name)
     return jsonify({
         "success": success,
         "message": "删除成功" if success else "删除失败"
@@ -123,7 +123,7 @@ def api_delete_config():
 def api_global_config():
     """获取全局配置"""
     try:
-        global_config = config_manager.load_global_config()
+        global_config = get_config_manager().load_global_config()
         return jsonify({
             "success": True,
             "config": global_config
@@ -139,7 +139,7 @@ def api_save_global_config():
         if not config_data:
             return jsonify({"success": False, "message": "配置数据不能为空"})
             
-        success = config_manager.save_global_config(config_data)
+        success = get_config_manager().save_global_config(config_data)
         
         if success:
             # 如果当前有选择的配置，重新选择以触发全局配置刷新
@@ -173,8 +173,8 @@ def api_save_global_config():
 def api_check_api_config():
     """检查API配置状态"""
     try:
-        is_valid, message = config_manager.validate_api_config()
-        api_config = config_manager.get_api_config()
+        is_valid, message = get_config_manager().validate_api_config()
+        api_config = get_config_manager().get_api_config()
         
         return jsonify({
             "success": True,
@@ -211,11 +211,11 @@ def api_auto_detect_files():
             })
         
         # 执行自动检测
-        success = config_manager.auto_detect_files(config_name)
+        success = get_config_manager().auto_detect_files(config_name)
         
         if success:
             # 获取更新后的配置统计信息
-            updated_config = config_manager.load_mod_config_only(config_name)
+            updated_config = get_config_manager().load_mod_config_only(config_name)
             csv_count = len(updated_config.get('csv_files', {}))
             json_count = len(updated_config.get('json_files', {}))
             jar_count = len(updated_config.get('jar_files', {}))
@@ -24,11 +24,19 @@ from pathlib import Path
 import traceback
 from flask import Blueprint, request, jsonify
 import logging
-from config_manager import config_manager
+from config_manager import get_config_manager
 import global_values
 from translate_helper.translate_helper_base import TranslateHelper
 from translation_object import TranslationObject
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 临时翻译文件逐行解析，优先使用 orjson，两者都可以直接接受 bytes
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 review_bp = Blueprint('review', __name__)
 
 logger = logging.getLogger(__name__)
@@ -41,7 +49,7 @@ def api_translation_review(file_path):
         return jsonify({"error": "未选择配置"})
     
     try:
-        config = config_manager.load_config(current_config_name)
+        config = get_config_manager().load_config(current_config_name)
         translate_helper = TranslateHelper(logger, config)
         file_type = translate_helper.get_file_type(file_path, config)
         temp_file = translate_helper.get_translated_temp_file_path(file_path)
@@ -51,11 +59,11 @@ def api_translation_review(file_path):
         
         # 读取翻译记录
         translations = []
-        with open(temp_file, 'r', encoding='utf-8') as f:
+        with open(temp_file, 'rb') as f:
             for line_num, line in enumerate(f, 1):
                 if line.strip():
                     try:
-                        record = json.loads(line)
+                        record = _json_loads(line)
                         translate_object = TranslationObject.from_dict(record)
                         translations.append(translate_object.to_dict())
                     except json.JSONDecodeError as e:
@@ -90,7 +98,7 @@ def api_save_translation_review(file_path):
             return jsonify({"success": False, "message": "没有翻译数据"})
         
         # 获取配置和翻译助手
-        config = config_manager.load_config(current_config_name)
+        config = get_config_manager().load_config(current_config_name)
         translate_helper = TranslateHelper(logger, config)
         file_type = translate_helper.get_file_type(file_path, config)
         temp_file = translate_helper.get_translated_temp_file_path(file_path)
@@ -100,11 +108,11 @@ def api_save_translation_review(file_path):
         
         # 读取现有的翻译记录
         existing_records = []
-        with open(temp_file, 'r', encoding='utf-8') as f:
+        with open(temp_file, 'rb') as f:
             for line_num, line in enumerate(f, 1):
                 if line.strip():
                     try:
-                        record = json.loads(line)
+                        record = _json_loads(line)
                         existing_records.append(record)
                     except json.JSONDecodeError:
                         continue
@@ -205,7 +213,7 @@ def api_sync_translation_memory(file_path):
     
     try:
         # 获取配置和翻译助手
-        config = config_manager.load_config(current_config_name)
+        config = get_config_manager().load_config(current_config_name)
         translate_helper = TranslateHelper(logger, config)
         temp_file = translate_helper.get_translated_temp_file_path(file_path)
         
@@ -214,11 +222,11 @@ def api_sync_translation_memory(file_path):
         
         # 读取现有的翻译记录
         existing_records = []
-        with open(temp_file, 'r', encoding='utf-8') as f:
+        with open(temp_file, 'rb') as f:
             for line_num, line in enumerate(f, 1):
                 if line.strip():
                     try:
-                        record = json.loads(line)
+                        record = _json_loads(line)
                         existing_records.append(record)
                     except json.JSONDecodeError:
                         continue
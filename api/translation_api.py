@@ -26,7 +26,7 @@ import tempfile
 import os
 from pathlib import Path
 from flask import Blueprint, request, jsonify, send_file
-from config_manager import config_manager
+from config_manager import get_config_manager
 import logging
 
 from progress_manager import ProgressManager
@@ -34,6 +34,14 @@ from translate_helper.translate_helper_base import TranslateHelper
 import global_values
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 临时翻译文件逐行解析，优先使用 orjson，两者都可以直接接受 bytes
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 translation_bp = Blueprint('translation', __name__)
 
 @translation_bp.route('/api/translate/start', methods=['POST'])
@@ -41,7 +49,7 @@ def api_start_translation():
     """开始翻译"""
     current_config_name = global_values.current_config_name
     # 验证API配置
-    is_valid, message = config_manager.validate_api_config()
+    is_valid, message = get_config_manager().validate_api_config()
     if not is_valid:
         return jsonify({"success": False, "message": f"API配置无效: {message}"})
     
@@ -93,7 +101,6 @@ def api_translation_status():
 
     # 获取基本翻译状态
     # print(global_values.current_config_name)
-    global_values.translator.progress_manager.refresh_files_status()
     current_progress = 0
     current_file_progress = global_values.translator.progress_manager.get_file_progress(global_values.translator.progress_manager.current_translated_file)
     if current_file_progress:
@@ -153,7 +160,7 @@ def api_translations():
     if not global_values.current_config_name:
         return jsonify({"error": "未选择配置"})
     
-    config = config_manager.load_config(global_values.current_config_name)
+    config = get_config_manager().load_config(global_values.current_config_name)
     
     try:
         pm = global_values.translator.get_progress_manager()
@@ -168,13 +175,16 @@ def api_translations():
             count = 0
             approved_count = 0
             try:
-                with open(translated_tmp_file, 'r', encoding='utf-8') as f:
+                # 以字节读取，按行交给 orjson 解析，省去逐行解码
+                with open(translated_tmp_file, 'rb') as f:
                     lines = [line for line in f if line.strip()]
                     count = len(lines)
                     approved_count = 0
                     for line in lines:
+                        if line.lstrip()[:1] != b'{':
+                            continue
                         try:
-                            record = json.loads(line)
+                            record = _json_loads(line)
                             if record.get('approved', False):
                                 approved_count += 1
                         except json.JSONDecodeError:
@@ -203,7 +213,7 @@ def api_translation_content(file_path):
         return jsonify({"error": "未选择配置"})
     
     try:
-        config = config_manager.load_config(global_values.current_config_name)
+        config = get_config_manager().load_config(global_values.current_config_name)
         work_dir = Path(config["work_directory"])
         # 添加模组路径
         mod_path = config.get("mod_path", "")
@@ -215,11 +225,11 @@ def api_translation_content(file_path):
             return jsonify({"error": "翻译文件不存在"})
         
         translations = []
-        with open(temp_file, 'r', encoding='utf-8') as f:
+        with open(temp_file, 'rb') as f:
             for line_num, line in enumerate(f):
                 if line.strip():
                     try:
-                        record = json.loads(line)
+                        record = _json_loads(line)
                         translations.append({
                             "line_num": line_num,
                             "record": record
@@ -243,7 +253,7 @@ def api_update_translation_content(file_path):
         data = request.json or {}
         translations = data.get('translations', [])
         
-        config = config_manager.load_config(global_values.current_config_name)
+        config = get_config_manager().load_config(global_values.current_config_name)
         work_dir = Path(config["work_directory"])
         # 添加模组路径
         mod_path = config.get("mod_path", "")
@@ -315,7 +325,7 @@ def api_export_translation_package():
         
         # 创建临时zip文件
         temp_dir = tempfile.mkdtemp()
-        config = config_manager.load_config(global_values.current_config_name)
+        config = get_config_manager().load_config(global_values.current_config_name)
         
         # 获取模组名称，用于zip文件名
         mod_path = config.get("mod_path", "")
@@ -24,14 +24,70 @@ Starsector翻译工具 - 修复版构建脚本
 import os
 import sys
 import subprocess
+import py_compile
 import shutil
 import zipfile
+import hashlib
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+# PyInstaller静态分析无法发现的模块 (动态导入/插件加载)
+# 标准库和直接import的第三方包由modulegraph自动收集，无需列出
+_REAL_HIDDEN = frozenset({
+    # ChromaDB相关依赖
+    'chromadb',
+    'chromadb.api',
+    'chromadb.config',
+    'chromadb.db',
+    'chromadb.db.impl',
+    'chromadb.db.impl.sqlite',
+    'chromadb.db.impl.grpc',
+    'chromadb.utils',
+    'chromadb.telemetry',
+    'duckdb',
+    'onnxruntime',
+    'overrides',
+    'posthog',
+    'pulsar_client',
+    'pydantic',
+    'typing_extensions',
+    # 项目模块
+    'api.config_api',
+    'api.translation_api',
+    'api.progress_api',
+    'api.terminology_api',
+    'api.review_api',
+    'api.memory_api',
+    'translate_helper.translate_helper_base',
+    'translate_helper.translate_helper_csv',
+    'translate_helper.translate_helper_jar',
+    'translate_helper.translate_helper_json',
+    'config_manager',
+    'global_values',
+    'improved_translator',
+    'progress_manager',
+    'translation_object',
+    'vector_translation_memory',
+    'model_manager',
+})
+
 def log(message):
     print(f"[BUILD] {message}")
 
+def _write_if_changed(path, content, encoding="utf-8"):
+    """仅在内容变化时写入文件，避免无意义地刷新mtime"""
+    path = Path(path)
+    if path.exists():
+        try:
+            if path.read_text(encoding=encoding, errors="replace") == content:
+                return False
+        except OSError:
+            pass
+    path.write_text(content, encoding=encoding)
+    return True
+
 def run_command_safe(cmd, cwd=None, show_full_output=False, timeout=None):
     """最安全的命令执行方式"""
     log(f"执行: {cmd}")
@@ -92,6 +148,70 @@ def thorough_pathlib_cleanup():
     
     return True
 
+def _walk_mtimes(root):
+    """遍历目录树，直接从DirEntry产出文件的修改时间"""
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    yield entry.stat(follow_symlinks=False).st_mtime
+
+def _file_hash(path):
+    """计算单个文件的内容摘要"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb", buffering=0) as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.digest()
+
+def _tree_hash(root, files):
+    """并行计算一组文件的内容哈希，并按相对路径合并为整体摘要"""
+    root = Path(root)
+    files = list(files)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        digests = list(executor.map(_file_hash, files))
+    
+    entries = sorted(
+        (Path(f).relative_to(root).as_posix(), digest)
+        for f, digest in zip(files, digests)
+    )
+    tree = hashlib.blake2b(digest_size=16)
+    for rel_path, digest in entries:
+        tree.update(rel_path.encode("utf-8"))
+        tree.update(b"\0")
+        tree.update(digest)
+    return tree.hexdigest()
+
+@contextmanager
+def _file_lock(lock_path):
+    """跨进程文件锁，防止并发构建同时写入缓存目录"""
+    with open(lock_path, "a+b") as lock_file:
+        if os.name == "nt":
+            import msvcrt
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
 def download_nodejs():
     """下载Node.js (利用缓存)"""
     node_version = "20.18.0"
@@ -100,44 +220,66 @@ def download_nodejs():
     temp_dir = Path("temp_nodejs")
     temp_dir.mkdir(exist_ok=True)
     
-    node_zip = temp_dir / "node.zip"
     node_dir = temp_dir / "nodejs"
+    version_file = node_dir / ".version"
     
-    # 检查Node.js是否已存在且版本正确
-    if node_dir.exists():
+    with _file_lock(temp_dir / ".lock"):
+        # 检查Node.js是否已存在且版本正确
         node_exe = node_dir / "node.exe"
         if node_exe.exists():
+            # 优先读取下载时写入的版本标记，避免启动node子进程
+            try:
+                if version_file.read_text(encoding="utf-8").strip() == node_version:
+                    log(f"✅ Node.js {node_version} 缓存有效，跳过下载")
+                    return node_dir
+            except OSError:
+                pass
+            
             try:
                 # 验证Node.js版本
                 result = subprocess.run([str(node_exe), "--version"], 
                                       capture_output=True, text=True, timeout=10)
                 if result.returncode == 0 and node_version in result.stdout:
+                    # 旧缓存没有版本标记，补写一次
+                    _write_if_changed(version_file, node_version)
                     log(f"✅ Node.js {node_version} 缓存有效，跳过下载")
                     return node_dir
                 else:
                     log("⚠️ Node.js版本不匹配，重新下载")
             except Exception:
                 log("⚠️ Node.js验证失败，重新下载")
-    
-    try:
-        log("📥 下载Node.js...")
-        urllib.request.urlretrieve(node_url, node_zip)
-        
-        log("📦 解压Node.js...")
-        with zipfile.ZipFile(node_zip, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
-        
-        extracted_dir = temp_dir / f"node-v{node_version}-win-x64"
-        if extracted_dir.exists():
-            extracted_dir.rename(node_dir)
         
-        node_zip.unlink()
-        log("✅ Node.js准备完成")
-        return node_dir
-        
-    except Exception as e:
-        log(f"❌ Node.js下载失败: {e}")
-        return None
+        # 解压到进程独占的临时目录，完整就绪后再原子替换缓存目录
+        staging_dir = temp_dir / f"nodejs.staging.{os.getpid()}"
+        node_zip = temp_dir / f"node.{os.getpid()}.zip"
+        try:
+            log("📥 下载Node.js...")
+            urllib.request.urlretrieve(node_url, node_zip)
+            
+            log("📦 解压Node.js...")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            with zipfile.ZipFile(node_zip, 'r') as zip_ref:
+                zip_ref.extractall(staging_dir)
+            
+            extracted_dir = staging_dir / f"node-v{node_version}-win-x64"
+            if not (extracted_dir / "node.exe").exists():
+                raise FileNotFoundError(f"压缩包中缺少 {extracted_dir.name}/node.exe")
+            (extracted_dir / ".version").write_text(node_version, encoding="utf-8")
+            
+            if node_dir.exists():
+                shutil.rmtree(node_dir)
+            os.replace(extracted_dir, node_dir)
+            
+            log("✅ Node.js准备完成")
+            return node_dir
+            
+        except Exception as e:
+            log(f"❌ Node.js下载失败: {e}")
+            return None
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            if node_zip.exists():
+                node_zip.unlink()
 
 def build_frontend():
     """构建前端 (利用缓存)"""
@@ -173,6 +315,7 @@ def build_frontend():
     
     # 检查是否需要重新构建
     dist_dir = frontend_dir / "dist"
+    hash_file = dist_dir / ".src_hash"
     need_build = True
     
     if dist_dir.exists():
@@ -181,9 +324,8 @@ def build_frontend():
             src_dir = frontend_dir / "src"
             if src_dir.exists():
                 # 获取src目录下最新文件的修改时间
-                src_files = list(src_dir.rglob("*"))
-                if src_files:
-                    latest_src_time = max(f.stat().st_mtime for f in src_files if f.is_file())
+                latest_src_time = max(_walk_mtimes(src_dir), default=0)
+                if latest_src_time:
                     dist_time = dist_dir.stat().st_mtime
                     
                     if dist_time > latest_src_time:
@@ -192,10 +334,28 @@ def build_frontend():
         except Exception:
             log("⚠️ 构建缓存检查失败，重新构建")
     
+    # 时间戳判定失效时再比较源码内容哈希，避免仅mtime变化导致的重复构建
+    src_hash = None
+    if need_build:
+        try:
+            input_files = [f for f in (frontend_dir / "src").rglob("*") if f.is_file()]
+            input_files += [f for f in (package_json, package_lock,
+                                        frontend_dir / "index.html",
+                                        frontend_dir / "vite.config.js") if f.exists()]
+            src_hash = _tree_hash(frontend_dir, input_files)
+            if dist_dir.exists() and hash_file.exists() and \
+                    hash_file.read_text(encoding="utf-8").strip() == src_hash:
+                log("✅ 前端源码内容未变化，跳过构建")
+                need_build = False
+        except Exception:
+            log("⚠️ 源码哈希计算失败，重新构建")
+    
     if need_build:
         log("🔨 构建Vue前端...")
         if not run_command_safe("npm run build", cwd=frontend_dir):
             return False
+        if src_hash:
+            _write_if_changed(hash_file, src_hash)
     
     # 复制构建结果
     try:
@@ -225,6 +385,7 @@ def build_frontend():
 def create_ultimate_spec(nodejs_dir):
     """创建PyInstaller配置"""
     nodejs_path = str(nodejs_dir).replace('\\', '/')
+    hiddenimports = "[\n" + "".join(f"        '{name}',\n" for name in sorted(_REAL_HIDDEN)) + "    ]"
     
     spec_content = f'''# -*- mode: python ; coding: utf-8 -*-
 
@@ -243,105 +404,7 @@ a = Analysis(
         ('{nodejs_path}', 'nodejs/'),
         ('models', 'models'),
     ],
-    hiddenimports=[
-        'flask',
-        'werkzeug',
-        'jinja2',
-        'click',
-        'itsdangerous',
-        'markupsafe',
-        'openai',
-        'anthropic',
-        'requests',
-        'urllib3',
-        'certifi',
-        'charset_normalizer',
-        'idna',
-        'argparse',
-        'logging',
-        'json',
-        'os',
-        'sys',
-        'threading',
-        'queue',
-        'time',
-        'datetime',
-        'hashlib',
-        'uuid',
-        'subprocess',
-        'tempfile',
-        'shutil',
-        'zipfile',
-        're',
-        # ChromaDB相关依赖
-        'chromadb',
-        'chromadb.api',
-        'chromadb.config',
-        'chromadb.db',
-        'chromadb.db.impl',
-        'chromadb.db.impl.sqlite',
-        'chromadb.db.impl.grpc',
-        'chromadb.utils',
-        'chromadb.telemetry',
-        'sqlite3',
-        'duckdb',
-        'onnxruntime',
-        'overrides',
-        'posthog',
-        'pulsar_client',
-        'pydantic',
-        'typing_extensions',
-        # C扩展模块 - 提高ChromaDB性能
-        '_testbuffer',
-        '_testcapi',
-        '_testimportmultiple',
-        '_testinternalcapi',
-        '_testmultiphase',
-        'array',
-        '_array',
-        'cmath',
-        'math',
-        '_datetime',
-        '_decimal',
-        '_heapq',
-        '_bisect',
-        '_random',
-        '_operator',
-        '_collections',
-        '_functools',
-        '_pickle',
-        '_json',
-        '_struct',
-        '_csv',
-        '_sqlite3',
-        '_lzma',
-        '_bz2',
-        'zlib',
-        '_hashlib',
-        '_md5',
-        '_sha1',
-        '_sha256',
-        '_sha512',
-        '_blake2',
-        '_sha3',
-        'api.config_api',
-        'api.translation_api', 
-        'api.progress_api',
-        'api.terminology_api',
-        'api.review_api',
-        'api.memory_api',
-        'translate_helper.translate_helper_base',
-        'translate_helper.translate_helper_csv',
-        'translate_helper.translate_helper_jar',
-        'translate_helper.translate_helper_json',
-        'config_manager',
-        'global_values',
-        'improved_translator',
-        'progress_manager',
-        'translation_object',
-        'vector_translation_memory',
-        'model_manager',
-    ],
+    hiddenimports={hiddenimports},
     hookspath=['.'],
     runtime_hooks=[],
     excludes=[
@@ -562,14 +625,9 @@ StarsectorTranslator.exe -p 8080  # 指定8080端口
 '''
     
     try:
-        with open(dist_dir / "start.bat", "w", encoding="utf-8", errors='ignore') as f:
-            f.write(start_bat)
-        
-        with open(dist_dir / "debug.bat", "w", encoding="utf-8", errors='ignore') as f:
-            f.write(debug_bat)
-        
-        with open(dist_dir / "README.md", "w", encoding="utf-8") as f:
-            f.write(readme)
+        _write_if_changed(dist_dir / "start.bat", start_bat)
+        _write_if_changed(dist_dir / "debug.bat", debug_bat)
+        _write_if_changed(dist_dir / "README.md", readme)
         
         log("✅ 分发文件创建完成")
     except Exception as e:
@@ -603,7 +661,6 @@ def main():
         # 6. 智能清理 (保留缓存)
         log("🧹 清理临时文件...")
         cleanup_items = [
-            "__pycache__",
             # 保留build目录作为PyInstaller缓存
             # "build",  
         ]
@@ -617,6 +674,14 @@ def main():
                     item_path.unlink()
                 log(f"✅ 清理: {item}")
         
+        # 字节码改为按内容哈希校验，mtime变化时无需重新编译
+        for py_file in Path(".").glob("*.py"):
+            try:
+                py_compile.compile(str(py_file), doraise=True,
+                                   invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+            except py_compile.PyCompileError as e:
+                log(f"⚠️ 字节码编译失败: {py_file} ({e.msg})")
+        
         # 保留重要缓存目录的说明
         cache_dirs = ["build", "temp_nodejs", "frontend/node_modules", "frontend/dist"]
         existing_cache = [d for d in cache_dirs if Path(d).exists()]
@@ -21,10 +21,10 @@ pathlib冲突清理脚本
 专门处理PyInstaller与pathlib包的冲突问题
 """
 
+import os
 import subprocess
 import sys
 import shutil
-from pathlib import Path
 
 def log(message):
     print(f"[CLEANUP] {message}")
@@ -51,34 +51,25 @@ def clean_pathlib():
         # 获取site-packages路径
         import site
         for site_dir in site.getsitepackages():
-            site_path = Path(site_dir)
+            if not os.path.isdir(site_dir):
+                continue
             
-            # 清理pathlib相关文件
-            pathlib_files = [
-                site_path / "pathlib.py",
-                site_path / "pathlib",
-                site_path / "pathlib-*.dist-info"
-            ]
-            
-            for pathlib_file in pathlib_files:
-                if pathlib_file.exists():
+            # 一次目录扫描匹配所有pathlib相关文件
+            with os.scandir(site_dir) as it:
+                for entry in it:
+                    name = entry.name
                     try:
-                        if pathlib_file.is_file():
-                            pathlib_file.unlink()
-                            log(f"删除文件: {pathlib_file}")
-                        elif pathlib_file.is_dir():
-                            shutil.rmtree(pathlib_file)
-                            log(f"删除目录: {pathlib_file}")
+                        if name == "pathlib.py":
+                            os.unlink(entry.path)
+                            log(f"删除文件: {entry.path}")
+                        elif name == "pathlib" and entry.is_dir():
+                            shutil.rmtree(entry.path)
+                            log(f"删除目录: {entry.path}")
+                        elif name.startswith("pathlib") and name.endswith(".dist-info"):
+                            shutil.rmtree(entry.path)
+                            log(f"删除目录: {entry.path}")
                     except Exception as e:
-                        log(f"删除 {pathlib_file} 时出错: {e}")
-                        
-            # 清理通配符匹配的文件
-            try:
-                for pathlib_dist in site_path.glob("pathlib*.dist-info"):
-                    shutil.rmtree(pathlib_dist)
-                    log(f"删除目录: {pathlib_dist}")
-            except Exception as e:
-                log(f"清理pathlib dist-info时出错: {e}")
+                        log(f"删除 {entry.path} 时出错: {e}")
                 
     except Exception as e:
         log(f"清理残留文件时出错: {e}")
@@ -21,27 +21,135 @@ along with ss_translator.  If not, see <https://www.gnu.org/licenses/>.
 支持动态加载和管理翻译配置
 """
 
+import copy
+import hashlib
+import io
 import json
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Callable
 import importlib
 import logging
 import csv
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _read_json(path: Path) -> Any:
+    """读取JSON文件，优先使用orjson"""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# 复用的JSON编码器（无orjson时使用）
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=4, separators=(',', ': '))
+
+
+def _write_json(path: Path, data: Any):
+    """写入JSON文件，优先使用orjson；标准库回退时分块流式写入，不构造完整字符串"""
+    with open(path, 'wb', buffering=64 * 1024) as f:
+        if orjson is not None:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return
+        with io.TextIOWrapper(f, encoding='utf-8', write_through=False) as text_file:
+            for chunk in _JSON_ENCODER.iterencode(data):
+                text_file.write(chunk)
+
+
+def _iter_files(root):
+    """递归遍历目录，产出 (文件名, 文件路径)"""
+    pending = deque([os.fspath(root)])
+    while pending:
+        directory = pending.popleft()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.name, entry.path
+
+
+# CSV字段内容分析使用的正则
+# 单次扫描同时查找句子模式和句子特征；句子模式放在前瞻中，避免与特征词互相吞掉匹配
+_SENTENCE_SCAN_RE = re.compile(
+    r'(?=(?P<sent>[a-zA-Z]{2,}\s+[a-zA-Z]{2,}))'  # 至少2个字母的单词
+    # 句子特征: 标点/引号、常见介词冠词、人称代词、常见动词
+    r'|(?P<ind>[.!?"]'
+    r'|\b(?:the|a|an|and|or|but|in|on|at|to|for|of|with|by'
+    r'|you|he|she|it|they|we|I'
+    r'|is|are|was|were|have|has|had|will|would|can|could)\b)',
+    re.IGNORECASE
+)
+# 标识符列表: ident1 纯标识符列表, ident2 包含下划线的标识符列表
+_IDENT_LIST_RE = re.compile(
+    r'(?P<ident1>[a-zA-Z]+\d+[,\s]*[a-zA-Z]*\d*$)'
+    r'|(?P<ident2>[a-zA-Z_]+[,\s]*[a-zA-Z_]+$)'
+)
+# 数字/布尔值判断用的常量
+_NUMBER_START_CHARS = frozenset("0123456789+-.")
+_FLOAT_SPECIAL_VALUES = frozenset({"nan", "inf", "infinity"})
+_BOOL_VALUES = frozenset({"true", "false"})
+
+
+def _make_field_classifier(field_rules: Dict) -> Callable[[List[str]], Tuple[Dict[str, str], Dict[str, int]]]:
+    """
+    根据字段规则预先计算字段分组，生成CSV表头分类函数
+    
+    返回的函数接收表头，返回 (规则已确定的字段配置, 需按内容分析的字段名 -> 列下标)
+    """
+    rules = field_rules["field_rules"]
+    # 字段名 -> 提取函数，None表示永不翻译；按优先级从低到高写入
+    rule_methods: Dict[str, Optional[str]] = {}
+    for key, method in (("options_fields", "get_options_text"),
+                        ("script_fields", "get_script_text"),
+                        ("raw_fields", "get_raw_text"),
+                        ("never_translate", None)):
+        for field in rules[key]:
+            rule_methods[field] = method
+    
+    def classify(fieldnames: List[str]) -> Tuple[Dict[str, str], Dict[str, int]]:
+        rule_config = {}
+        # 重名字段以最后一列为准
+        undecided_fields = {}
+        for index, field in enumerate(fieldnames):
+            if field in rule_methods:
+                method = rule_methods[field]
+                if method:
+                    rule_config[field] = method
+            else:
+                undecided_fields[field] = index
+        return rule_config, undecided_fields
+    
+    return classify
+
+
 class ConfigManager:
     """配置管理器"""
     
     def __init__(self, configs_dir: str = "configs"):
         self.configs_dir = Path(configs_dir)
-        self.configs_dir.mkdir(exist_ok=True)
         
         # 全局配置文件路径
         self.global_config_path = self.configs_dir / "global_config.json"
         
-        # 创建默认全局配置（如果不存在）
-        self._ensure_global_config()
+        # 配置目录和默认全局配置在首次访问时才创建
+        self._initialized = False
+        
+        # 全局配置缓存，按文件mtime失效
+        self._global_cache: Optional[Dict[str, Any]] = None
+        self._global_mtime = 0
+        self._api_config_cache: Optional[Dict[str, str]] = None
+        
+        # 模组配置及规则文件缓存: 路径 -> (mtime_ns, 解析结果)
+        self._json_cache: Dict[Path, Tuple[int, Any]] = {}
         
         # 可用的提取函数映射
         self.available_extract_functions = {
@@ -52,6 +160,14 @@ class ConfigManager:
             "jar_extract": "从JAR文件提取硬编码字符串"
         }
     
+    def _init_disk(self):
+        """首次访问配置时创建配置目录和默认全局配置"""
+        if self._initialized:
+            return
+        self.configs_dir.mkdir(exist_ok=True)
+        self._ensure_global_config()
+        self._initialized = True
+    
     def _ensure_global_config(self):
         """确保全局配置文件存在"""
         if not self.global_config_path.exists():
@@ -62,6 +178,8 @@ class ConfigManager:
                 "max_tokens": 2000,
                 "request_interval": 0.1,
                 "max_retries": 10,
+                "concurrency": 16,
+                "file_concurrency": 4,
                 "work_directory": "translation_work",
                 "log_file": "translation.log",
                 "terminology_file": "terminology.json",
@@ -70,25 +188,49 @@ class ConfigManager:
                 "description": "全局翻译配置，包含API密钥和通用参数"
             }
             
-            with open(self.global_config_path, 'w', encoding='utf-8') as f:
-                json.dump(default_global_config, f, ensure_ascii=False, indent=4)
+            _write_json(self.global_config_path, default_global_config)
             
             logging.info(f"已创建默认全局配置文件: {self.global_config_path}")
     
+    def _load_json_cached(self, path: Path, copy_result: bool = True) -> Any:
+        """
+        按 (路径, mtime) 缓存读取JSON文件
+        
+        默认返回副本以免调用方修改缓存；copy_result=False 时返回缓存对象本身，调用方只能读取
+        """
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._json_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, _read_json(path))
+            self._json_cache[path] = cached
+        return copy.deepcopy(cached[1]) if copy_result else cached[1]
+    
+    def _invalidate_global_cache(self):
+        """清空全局配置缓存"""
+        self._global_cache = None
+        self._global_mtime = 0
+        self._api_config_cache = None
+    
     def load_global_config(self) -> Dict[str, Any]:
         """加载全局配置"""
+        self._init_disk()
         try:
-            with open(self.global_config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            mtime = os.stat(self.global_config_path).st_mtime_ns
+            if self._global_cache is None or mtime != self._global_mtime:
+                self._global_cache = _read_json(self.global_config_path)
+                self._global_mtime = mtime
+                self._api_config_cache = None
+            return self._global_cache.copy()
         except Exception as e:
             logging.error(f"加载全局配置失败: {e}")
             return {}
     
     def save_global_config(self, config_data: Dict[str, Any]) -> bool:
         """保存全局配置"""
+        self._init_disk()
         try:
-            with open(self.global_config_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=4)
+            self._invalidate_global_cache()
+            _write_json(self.global_config_path, config_data)
             return True
         except Exception as e:
             logging.error(f"保存全局配置失败: {e}")
@@ -107,11 +249,13 @@ class ConfigManager:
     def get_api_config(self) -> Dict[str, str]:
         """获取API相关配置"""
         global_config = self.load_global_config()
-        return {
-            "api_key": global_config.get("api_key", ""),
-            "base_url": global_config.get("base_url", ""),
-            "model": global_config.get("model", "")
-        }
+        if self._api_config_cache is None:
+            self._api_config_cache = {
+                "api_key": global_config.get("api_key", ""),
+                "base_url": global_config.get("base_url", ""),
+                "model": global_config.get("model", "")
+            }
+        return self._api_config_cache.copy()
     
     def validate_api_config(self) -> tuple[bool, str]:
         """验证API配置是否有效"""
@@ -130,25 +274,25 @@ class ConfigManager:
     
     def get_available_configs(self) -> List[Dict[str, str]]:
         """获取所有可用的配置文件（排除全局配置）"""
+        self._init_disk()
         configs = []
         
-        for config_file in self.configs_dir.glob("*.json"):
-            # 排除全局配置
-            if config_file.stem == "global_config":
+        for file_name in os.listdir(self.configs_dir):
+            # 排除全局配置和规则文件
+            if not file_name.endswith('.json') or file_name in ('global_config.json', 'fix_rules.json'):
                 continue
-            if config_file.stem == "fix_rules":
-                continue
-                
+            
+            config_name = file_name[:-5]
             try:
-                config = self.load_mod_config_only(config_file.stem)
+                config = self._load_json_cached(self.configs_dir / file_name, copy_result=False)
                 configs.append({
-                    "filename": config_file.stem,
-                    "name": config.get("config_name", config_file.stem),
+                    "filename": config_name,
+                    "name": config.get("config_name", config_name),
                     "description": config.get("description", ""),
                     "mod_path": config.get("mod_path", "")
                 })
             except Exception as e:
-                logging.warning(f"无法加载配置文件 {config_file}: {e}")
+                logging.warning(f"无法加载配置文件 {file_name}: {e}")
                 
         return configs
     
@@ -167,8 +311,7 @@ class ConfigManager:
         if not config_path.exists():
             raise FileNotFoundError(f"配置文件不存在: {config_path}")
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            mod_config = json.load(f)
+        mod_config = self._load_json_cached(config_path)
         
         # 合并配置：全局配置作为基础，模组配置覆盖
         merged_config = global_config.copy()
@@ -184,20 +327,21 @@ class ConfigManager:
     
     def load_mod_config_only(self, config_name: str) -> Dict[str, Any]:
         """仅加载模组配置（不合并全局配置）"""
+        self._init_disk()
         config_path = self.configs_dir / f"{config_name}.json"
         
         if not config_path.exists():
             raise FileNotFoundError(f"配置文件不存在: {config_path}")
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return self._load_json_cached(config_path)
     
     def save_config(self, config_name: str, config_data: Dict[str, Any]) -> bool:
         """保存配置"""
+        self._init_disk()
         try:
             config_path = self.configs_dir / f"{config_name}.json"
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=4)
+            self._json_cache.pop(config_path, None)
+            _write_json(config_path, config_data)
             return True
         except Exception as e:
             logging.error(f"保存配置失败: {e}")
@@ -205,8 +349,10 @@ class ConfigManager:
     
     def delete_config(self, config_name: str) -> bool:
         """删除配置"""
+        self._init_disk()
         try:
             config_path = self.configs_dir / f"{config_name}.json"
+            self._json_cache.pop(config_path, None)
             if config_path.exists():
                 config_path.unlink()
                 return True
@@ -263,8 +409,7 @@ class ConfigManager:
             # 加载CSV字段规则
             rules_file = Path("./configs/fix_rules.json")
             if rules_file.exists():
-                with open(rules_file, 'r', encoding='utf-8') as f:
-                    field_rules = json.load(f)
+                field_rules = self._load_json_cached(rules_file)
             else:
                 # 使用默认规则
                 field_rules = {
@@ -288,37 +433,74 @@ class ConfigManager:
                     }
                 }
             
+            # 规则摘要，规则变化时上次的CSV分析结果全部失效
+            rules_digest = hashlib.md5(
+                json.dumps(field_rules, sort_keys=True, ensure_ascii=False).encode('utf-8')
+            ).hexdigest()
+            
+            # 规则列表转换为frozenset，加速逐行的成员判断
+            for key in ("raw_fields", "never_translate", "script_fields", "options_fields"):
+                field_rules["field_rules"][key] = frozenset(field_rules["field_rules"][key])
+            field_rules["skip_values"] = frozenset(field_rules["skip_values"])
+            ignore_json_files = frozenset(field_rules.get("ignore_json_files", {}))
+            classifier = _make_field_classifier(field_rules)
+            
             # 初始化配置
             csv_files = {}
             json_files = {}
             jar_files = {}
             
+            # 上次扫描记录的CSV指纹: 相对路径 -> [mtime_ns, 大小, 分析结果]
+            previous = config_data.get("_fingerprints") or {}
+            previous_files = previous.get("files", {}) if previous.get("rules") == rules_digest else {}
+            fingerprints = {}
+            csv_entries = []
+            
             # 扫描data文件夹中的CSV和JSON文件
             data_dir = mod_dir / "data"
             if data_dir.exists():
-                for file_path in data_dir.rglob("*"):
-                    if file_path.is_file():
-                        relative_path = f"./{file_path.relative_to(mod_dir).as_posix()}"
-                        
-                        if file_path.suffix.lower() == '.csv':
-                            csv_config = self._analyze_csv_file(file_path, field_rules, relative_path)
-                            if csv_config:
-                                csv_files[relative_path] = csv_config
-                        
-                        elif file_path.suffix.lower() == '.json':
-                            if file_path.name in field_rules.get("ignore_json_files", {}):
-                                continue
-                            json_files[relative_path] = {
-                                "description": "JSON文件",
-                                "extract_function": "extract_json_leaf_values"
-                            }
+                for file_name, file_path in _iter_files(data_dir):
+                    suffix = os.path.splitext(file_name)[1].lower()
+                    if suffix not in ('.csv', '.json'):
+                        continue
+                    relative_path = "./" + os.path.relpath(file_path, mod_dir).replace('\\', '/')
+                    
+                    if suffix == '.csv':
+                        stat = os.stat(file_path)
+                        csv_entries.append((relative_path, file_path, [stat.st_mtime_ns, stat.st_size]))
+                    
+                    else:
+                        if file_name in ignore_json_files:
+                            continue
+                        json_files[relative_path] = {
+                            "description": "JSON文件",
+                            "extract_function": "extract_json_leaf_values"
+                        }
+            
+            # 并行分析有变化的CSV文件，未变化的直接复用上次结果
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = {}
+                for relative_path, file_path, fingerprint in csv_entries:
+                    cached = previous_files.get(relative_path)
+                    if not (cached and cached[:2] == fingerprint):
+                        futures[relative_path] = executor.submit(
+                            self._analyze_csv_file, Path(file_path), field_rules, relative_path, classifier)
+                
+                for relative_path, file_path, fingerprint in csv_entries:
+                    if relative_path in futures:
+                        csv_config = futures[relative_path].result()
+                    else:
+                        csv_config = previous_files[relative_path][2]
+                    fingerprints[relative_path] = fingerprint + [csv_config]
+                    if csv_config:
+                        csv_files[relative_path] = csv_config
             
             # 扫描jars文件夹中的JAR文件
             jars_dir = mod_dir / "jars"
             if jars_dir.exists():
-                for file_path in jars_dir.rglob("*"):
-                    if file_path.is_file() and file_path.suffix.lower() == '.jar':
-                        relative_path = f"./{file_path.relative_to(mod_dir).as_posix()}"
+                for file_name, file_path in _iter_files(jars_dir):
+                    if os.path.splitext(file_name)[1].lower() == '.jar':
+                        relative_path = "./" + os.path.relpath(file_path, mod_dir).replace('\\', '/')
                         jar_files[relative_path] = {
                             "backup_suffix": ".backup",
                             "description": "JAR包中的硬编码文本",
@@ -331,6 +513,7 @@ class ConfigManager:
             config_data["json_files"] = json_files
             config_data["jar_files"] = jar_files
             config_data["name"] = config_name
+            config_data["_fingerprints"] = {"rules": rules_digest, "files": fingerprints}
             
             # 保存配置
             success = self.save_config(config_name, config_data)
@@ -346,7 +529,8 @@ class ConfigManager:
             logging.error(f"自动检测文件失败: {e}")
             return False
     
-    def _analyze_csv_file(self, file_path: Path, field_rules: Dict, relative_path: str) -> Optional[Dict[str, str]]:
+    def _analyze_csv_file(self, file_path: Path, field_rules: Dict, relative_path: str,
+                          classifier: Optional[Callable] = None) -> Optional[Dict[str, str]]:
         """
         分析CSV文件，确定每个字段的翻译方法
         
@@ -354,12 +538,14 @@ class ConfigManager:
             file_path: CSV文件路径
             field_rules: 字段规则配置
             relative_path: 相对路径
+            classifier: _make_field_classifier 生成的字段分类函数，为None时按field_rules现场生成
             
         Returns:
             Dict[str, str]: 字段名到提取函数的映射，如果不需要翻译则返回None
         """
         try:
-            
+            if classifier is None:
+                classifier = _make_field_classifier(field_rules)
             
             # 检查是否有固定配置
             file_name = file_path.name
@@ -370,46 +556,51 @@ class ConfigManager:
             
             # 读取CSV文件进行分析
             with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
-                # 检测分隔符
-                sample = csvfile.read(1024)
-                csvfile.seek(0)
-                sniffer = csv.Sniffer()
-                # try:
-                #     delimiter = sniffer.sniff(sample).delimiter
-                # except:
-                delimiter = ','
+                # 固定使用逗号分隔，与 TranslateHelperCSV 提取和应用翻译时的读取方式保持一致
+                reader = csv.reader(csvfile, delimiter=',')
+                fieldnames = next(reader, None)
                 
-                reader = csv.DictReader(csvfile, delimiter=delimiter)
-                
-                if not reader.fieldnames:
+                if not fieldnames:
                     return None
                 
-                # 分析每个字段
-                field_config = {}
-                valid_fieldnames = [f for f in reader.fieldnames if f is not None]
+                # 规则分组内的字段直接确定，其余字段需要按内容分析
+                rule_config, undecided_fields = classifier(fieldnames)
                 field_analysis = {field: {"has_text": False, "has_numbers": False, "has_booleans": False, "has_underline": False, "has_path": False, "is_sentence": False, "has_escape": False} 
-                                for field in valid_fieldnames}
+                                for field in undecided_fields}
+                
+                skip_values = field_rules["skip_values"]
                 
                 # 读取前100行进行分析
                 row_count = 0
                 for row in reader:
-                    if row_count >= 100:
+                    # 跳过空行
+                    if not row:
+                        continue
+                    if row_count >= 100 or not undecided_fields:
                         break
                     row_count += 1
                     
-                    for field, value in row.items():
-                        if field is None or not isinstance(value, str):
+                    row_len = len(row)
+                    for field, index in list(undecided_fields.items()):
+                        if index >= row_len:
                             continue
-                        if not value or value.strip() in field_rules["skip_values"]:
+                        value = row[index]
+                        if not value:
                             continue
-                        
                         value = value.strip()
+                        if not value or value in skip_values:
+                            continue
                         
-                        # 检查是否包含英文句子模式（改进版，支持标点符号）
-                        sentence_pattern = r'[a-zA-Z]{2,}\s+[a-zA-Z]{2,}'  # 至少2个字母的单词
-                        
-                        # 检查基本句子模式
-                        has_sentence_pattern = re.search(sentence_pattern, value)
+                        # 检查是否包含英文句子模式（改进版，支持标点符号）及句子特征
+                        has_sentence_pattern = False
+                        has_sentence_indicators = False
+                        for match in _SENTENCE_SCAN_RE.finditer(value):
+                            if match.lastgroup == "sent":
+                                has_sentence_pattern = True
+                            else:
+                                has_sentence_indicators = True
+                            if has_sentence_pattern and has_sentence_indicators:
+                                break
                         
                         if has_sentence_pattern:
                             # 进一步检查是否是真正的句子 vs 配置项
@@ -418,39 +609,31 @@ class ConfigManager:
                             # 排除明显的配置项和标识符（但允许标点符号）
                             if ('_' in value and '.' not in value and '"' not in value):  # 下划线标识符（但不是句子中的引用）
                                 is_likely_sentence = False
-                            elif re.search(r'^[a-zA-Z]+\d+[,\s]*[a-zA-Z]*\d*$', value):  # 纯标识符列表
-                                is_likely_sentence = False
-                            elif re.search(r'^[a-zA-Z_]+[,\s]*[a-zA-Z_]+$', value) and '_' in value and '"' not in value:  # 包含下划线的标识符列表
-                                is_likely_sentence = False
-                            
-                            # 如果包含句子特征，确定是需要翻译的文本
-                            sentence_indicators = [
-                                r'[.!?"]',  # 句号、感叹号、问号、引号
-                                r'\b(the|a|an|and|or|but|in|on|at|to|for|of|with|by)\b',  # 常见英文介词/冠词
-                                r'\b(you|he|she|it|they|we|I)\b',  # 人称代词
-                                r'\b(is|are|was|were|have|has|had|will|would|can|could)\b',  # 常见动词
-                            ]
-                            
-                            has_sentence_indicators = False
-                            for indicator in sentence_indicators:
-                                if re.search(indicator, value, re.IGNORECASE):
-                                    has_sentence_indicators = True
-                                    break
+                            else:
+                                ident_match = _IDENT_LIST_RE.match(value)
+                                if ident_match and (ident_match.lastgroup == "ident1"
+                                                    or ('_' in value and '"' not in value)):
+                                    is_likely_sentence = False
                             
                             # 如果有句子指示词，肯定是句子；如果没有但通过基本检查，也可能是简单的名词短语
                             if is_likely_sentence and (has_sentence_indicators or len(value.split()) <= 4):
                                 field_analysis[field]["has_text"] = True
                                 field_analysis[field]["is_sentence"] = True
+                                # 已确定需要翻译，后续行不再分析该字段
+                                del undecided_fields[field]
+                                continue
                         
-                        # 检查是否是纯数字
-                        try:
-                            float(value)
-                            field_analysis[field]["has_numbers"] = True
-                        except ValueError:
-                            pass
+                        # 检查是否是纯数字（先按首字符粗筛，避免大多数文本进入异常路径）
+                        lowered = value.lower()
+                        if value[0] in _NUMBER_START_CHARS or lowered in _FLOAT_SPECIAL_VALUES:
+                            try:
+                                float(value)
+                                field_analysis[field]["has_numbers"] = True
+                            except ValueError:
+                                pass
                         
                         # 检查是否是布尔值
-                        if value.upper() in ["TRUE", "FALSE"]:
+                        if lowered in _BOOL_VALUES:
                             field_analysis[field]["has_booleans"] = True
                         else:
                             # 检查是否包含有意义的文本
@@ -464,34 +647,23 @@ class ConfigManager:
                         if "/" in value:
                             field_analysis[field]["has_path"] = True
                 
-                # 根据分析结果决定翻译方法
-                for field in valid_fieldnames:
-                    if field in field_rules["field_rules"]["never_translate"]:
-                        continue
-                    
-                    if field in field_rules["field_rules"]["raw_fields"]:
-                        field_config[field] = "get_raw_text"
-                    elif field in field_rules["field_rules"]["script_fields"]:
-                        field_config[field] = "get_script_text"
-                    elif field in field_rules["field_rules"]["options_fields"]:
-                        field_config[field] = "get_options_text"
-                    else:
-                        # 根据内容分析决定
-                        analysis = field_analysis[field]
+                # 根据规则分组和内容分析结果决定翻译方法
+                field_config = {}
+                for field in fieldnames:
+                    if field in rule_config:
+                        field_config[field] = rule_config[field]
+                    elif field in field_analysis and field_analysis[field]["is_sentence"]:
                         # 如果是明显的英文句子, 优先考虑翻译
-                        if analysis["is_sentence"]:
-                            field_config[field] = "get_raw_text"
-                            continue
-                        # # 存在数字或布尔值，不翻译
-                        # if (analysis["has_numbers"] or analysis["has_booleans"]) and not analysis["has_text"]:
-                        #     continue
-                        # if analysis["has_underline"] or analysis["has_path"]:
-                        #     continue
-                        
-                        # # 如果有文本内容
-                        # if analysis["has_text"]:
-                        #     field_config[field] = "get_raw_text"
-                            
+                        field_config[field] = "get_raw_text"
+                    # # 存在数字或布尔值，不翻译
+                    # if (analysis["has_numbers"] or analysis["has_booleans"]) and not analysis["has_text"]:
+                    #     continue
+                    # if analysis["has_underline"] or analysis["has_path"]:
+                    #     continue
+                    
+                    # # 如果有文本内容
+                    # if analysis["has_text"]:
+                    #     field_config[field] = "get_raw_text"
                 
                 return field_config if field_config else None
                 
@@ -499,5 +671,13 @@ class ConfigManager:
             logging.warning(f"分析CSV文件失败 {file_path}: {e}")
             return None
 
-# 全局配置管理器实例
-config_manager = ConfigManager()
\ No newline at end of file
+# 全局配置管理器实例（按需创建）
+_config_manager: Optional[ConfigManager] = None
+
+
+def get_config_manager() -> ConfigManager:
+    """获取全局配置管理器实例"""
+    global _config_manager
+    if _config_manager is None:
+        _config_manager = ConfigManager()
+    return _config_manager
@@ -20,8 +20,14 @@ along with ss_translator.  If not, see <https://www.gnu.org/licenses/>.
 结合 ChromaDB（语义搜索）和 SQLite（精确查询）的优势
 """
 
+import atexit
+import copy
 import hashlib
-from typing import Dict, List, Optional, Tuple
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 import logging
 from pathlib import Path
@@ -31,6 +37,17 @@ from sqlite_translation_memory import SQLiteTranslationMemory
 
 logger = logging.getLogger(__name__)
 
+# translation_key 读缓存的最大条目数
+_TRANSLATION_CACHE_SIZE = 4096
+
+# 向量数据库异步写入队列容量、单批最大条数和凑批等待时间（秒）
+_VECTOR_QUEUE_SIZE = 10000
+_VECTOR_BATCH_SIZE = 256
+_VECTOR_BATCH_WAIT = 0.05
+
+# 退出批量导入模式时，每次同步到向量数据库的记录数
+_VECTOR_SYNC_CHUNK_SIZE = 1000
+
 
 class DatabaseInterface:
     """数据库操作统一接口，结合向量数据库和关系数据库"""
@@ -41,10 +58,176 @@ class DatabaseInterface:
         workspace_path.mkdir(exist_ok=True)
         self.vector_memory = VectorTranslationMemory(str(workspace_path / "vector"))
         self.sqlite_memory = SQLiteTranslationMemory(str(workspace_path / "sqlite"))
+        
+        # (config_name, translation_key) -> TranslationObject 的 LRU 读缓存，写入对应键时失效
+        self._trans_cache: "OrderedDict[Tuple[str, str], TranslationObject]" = OrderedDict()
+        self._trans_cache_lock = threading.Lock()
+        # 每次失效或清空缓存时递增，读库期间发生过失效的结果不写入缓存
+        self._trans_cache_generation = 0
+        
+        # 向量数据库写入较慢，放到后台线程中批量执行，SQLite 提交后即可返回
+        self._vec_queue = queue.Queue(maxsize=_VECTOR_QUEUE_SIZE)
+        self._vec_thread = threading.Thread(target=self._vec_worker, name="vector-writer", daemon=True)
+        self._vec_thread.start()
+        # 进程退出前写完队列中剩余的记录
+        atexit.register(self._stop_vector_worker)
+        
+        # 批量导入模式：暂停逐条写入向量数据库，只记录待同步的键，退出该模式时统一同步
+        self._bulk_mode = False
+        self._pending_vector_sync: Dict[str, set] = {}
     
     def close(self):
         """关闭所有数据库连接"""
+        if self._pending_vector_sync:
+            self.bulk_mode(False)
+        self._stop_vector_worker()
         self.sqlite_memory.close_all_connections()
+        self._clear_translation_cache()
+    
+    # ===================== 批量导入模式 =====================
+    
+    def bulk_mode(self, enabled: bool) -> Tuple[int, int]:
+        """开启或关闭批量导入模式
+        
+        开启后 add_translation_history 和 update_translation_batch 只写 SQLite，
+        关闭时把期间涉及的记录一次性同步到向量数据库
+        
+        Returns:
+            Tuple[同步成功数量, 同步失败数量]，开启时返回 (0, 0)
+        """
+        if enabled:
+            self._bulk_mode = True
+            return 0, 0
+        
+        self._bulk_mode = False
+        return self._sync_pending_vectors()
+    
+    def _mark_vector_pending(self, config_name: str, translation_keys: Iterable[str]):
+        """记录批量导入模式下尚未写入向量数据库的键"""
+        self._pending_vector_sync.setdefault(config_name, set()).update(
+            key for key in translation_keys if key
+        )
+    
+    def _discard_vector_pending(self, config_name: str, translation_keys: Iterable[str]):
+        """删除记录时一并移除待同步的键"""
+        pending = self._pending_vector_sync.get(config_name)
+        if pending:
+            pending.difference_update(translation_keys)
+    
+    def _sync_pending_vectors(self) -> Tuple[int, int]:
+        """将批量导入模式期间涉及的记录按 SQLite 中的最新数据写入向量数据库"""
+        synced_count = 0
+        error_count = 0
+        pending_sync, self._pending_vector_sync = self._pending_vector_sync, {}
+        
+        self._flush_vector_queue()
+        for config_name, translation_keys in pending_sync.items():
+            translation_keys = list(translation_keys)
+            for start in range(0, len(translation_keys), _VECTOR_SYNC_CHUNK_SIZE):
+                chunk = translation_keys[start:start + _VECTOR_SYNC_CHUNK_SIZE]
+                sqlite_objs = self.sqlite_memory.get_translations_by_keys(config_name, chunk)
+                success, errors = self.vector_memory.add_translation_history_batch(config_name, list(sqlite_objs.values()))
+                synced_count += success
+                error_count += errors + len(chunk) - len(sqlite_objs)
+        
+        if pending_sync:
+            logger.info(f"批量导入模式结束，向量数据库同步完成: 成功 {synced_count}, 失败 {error_count}")
+        return synced_count, error_count
+    
+    # ===================== 向量数据库异步写入 =====================
+    
+    def _vec_worker(self):
+        """后台线程：从队列取出待写入的翻译历史，凑批后写入向量数据库"""
+        while True:
+            item = self._vec_queue.get()
+            if item is None:
+                self._vec_queue.task_done()
+                return
+            
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + _VECTOR_BATCH_WAIT
+            while len(batch) < _VECTOR_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._vec_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            # 按配置分组写入
+            grouped = {}
+            for config_name, translation_obj in batch:
+                grouped.setdefault(config_name, []).append(translation_obj)
+            for config_name, translation_objects in grouped.items():
+                try:
+                    self.vector_memory.add_translation_history_batch(config_name, translation_objects)
+                except Exception as e:
+                    logger.error(f"异步写入向量数据库失败 {config_name}: {e}")
+            
+            for _ in batch:
+                self._vec_queue.task_done()
+            if stop:
+                self._vec_queue.task_done()
+                return
+    
+    def _flush_vector_queue(self):
+        """等待队列中已提交的向量写入完成，保证后续的删除/更新不会被旧写入覆盖"""
+        if self._vec_thread.is_alive():
+            self._vec_queue.join()
+    
+    def _stop_vector_worker(self):
+        """写完队列中剩余的记录并停止后台线程"""
+        if self._vec_thread.is_alive():
+            self._vec_queue.put(None)
+            self._vec_thread.join()
+    
+    # ===================== 翻译记录缓存 =====================
+    
+    def _get_cached_translation(self, config_name: str, translation_key: str, db = None) -> Optional[TranslationObject]:
+        """
+        先查 LRU 缓存，未命中再读 SQLite 并写入缓存
+        
+        使用调用方传入的连接读取时不写入缓存，该连接上可能有尚未提交的数据
+        """
+        cache_key = (config_name, translation_key)
+        with self._trans_cache_lock:
+            cached = self._trans_cache.get(cache_key)
+            if cached is not None:
+                self._trans_cache.move_to_end(cache_key)
+                # 返回副本，避免调用方修改缓存中的对象
+                return copy.copy(cached)
+            generation = self._trans_cache_generation
+        
+        result = self.sqlite_memory.get_translation_by_key(config_name, translation_key, db)
+        if result is not None and db is None:
+            with self._trans_cache_lock:
+                if generation != self._trans_cache_generation:
+                    # 读库期间有写入使缓存失效，读到的可能是旧记录
+                    return result
+                self._trans_cache[cache_key] = copy.copy(result)
+                self._trans_cache.move_to_end(cache_key)
+                if len(self._trans_cache) > _TRANSLATION_CACHE_SIZE:
+                    self._trans_cache.popitem(last=False)
+        return result
+    
+    def _invalidate_translation_cache(self, config_name: str, translation_keys: Iterable[str]):
+        """写入或删除翻译记录后，移除对应键的缓存"""
+        with self._trans_cache_lock:
+            self._trans_cache_generation += 1
+            for translation_key in translation_keys:
+                self._trans_cache.pop((config_name, translation_key), None)
+    
+    def _clear_translation_cache(self):
+        """清空翻译记录缓存"""
+        with self._trans_cache_lock:
+            self._trans_cache_generation += 1
+            self._trans_cache.clear()
     
     # ===================== 专有名词管理 =====================
     
@@ -93,6 +276,10 @@ class DatabaseInterface:
         """搜索专有名词，使用向量数据库的精确匹配"""
         return self.vector_memory.search_terminology(text, threshold)
     
+    def search_terminology_batch(self, texts: List[str], threshold: float = 0.8) -> List[List[Dict]]:
+        """批量搜索多段文本中的专有名词，结果与 texts 一一对应"""
+        return self.vector_memory.search_terminology_batch(texts, threshold)
+    
     def get_terminology_list(self, search_text: str = "", domain: str = "") -> List[Dict]:
         """获取专有名词列表，使用 SQLite 查询"""
         return self.sqlite_memory.search_terminology(search_text, domain)
@@ -112,11 +299,19 @@ class DatabaseInterface:
 
         # 先添加到 SQLite（主要数据存储）
         sqlite_success = self.sqlite_memory.add_translation(config_name, translation_obj, sql_db)
+        self._invalidate_translation_cache(config_name, (translation_obj.translation_key,))
         
-        # 再添加到向量数据库（只存储用于语义搜索的字段）
-        vector_key = ""
-        if sqlite_success:
-            vector_key = self.vector_memory.add_translation_history(config_name, translation_obj)
+        # 再交给后台线程写入向量数据库（只存储用于语义搜索的字段）
+        if sqlite_success and self._bulk_mode:
+            self._mark_vector_pending(config_name, (translation_obj.translation_key,))
+        elif sqlite_success:
+            try:
+                if not self._vec_thread.is_alive():
+                    raise queue.Full
+                self._vec_queue.put_nowait((config_name, copy.copy(translation_obj)))
+            except queue.Full:
+                # 队列已满或后台线程已停止时同步写入
+                self.vector_memory.add_translation_history(config_name, translation_obj)
         
         if sqlite_success:
             return translation_obj.translation_key
@@ -127,43 +322,61 @@ class DatabaseInterface:
         """更新翻译历史"""
         # 先更新 SQLite
         sqlite_success = self.sqlite_memory.update_translation(config_name, translation_key, updated_translation_obj)
+        self._invalidate_translation_cache(config_name, (translation_key,))
         
         return sqlite_success
     
     def get_exact_translation(self, config_name: str, source_text: str = "", translation_key: str = "", db = None) -> Optional[TranslationObject]:
         """获取精确匹配的翻译，直接使用 SQLite 查询"""
         if translation_key:
-            return self.sqlite_memory.get_translation_by_key(config_name, translation_key, db)
+            return self._get_cached_translation(config_name, translation_key, db)
         elif source_text:
             # 使用 SQLite 进行精确文本匹配
             return self.sqlite_memory.get_translation_by_original_text(config_name, source_text)
         return None
     
     def get_sqlite_connection(self, config_name: str):
-        """获取指定配置的 SQLite 连接, 用户自行管理生命周期"""
+        """获取指定配置的 SQLite 连接；连接由翻译记忆库长期复用，调用方不要关闭"""
         return self.sqlite_memory.get_translation_connection(config_name)
     
     def get_translation_by_key(self, config_name: str, translation_key: str) -> Optional[TranslationObject]:
-        """根据 translation_key 获取翻译，直接使用 SQLite"""
-        return self.sqlite_memory.get_translation_by_key(config_name, translation_key)
+        """根据 translation_key 获取翻译，优先使用缓存，未命中时查询 SQLite"""
+        return self._get_cached_translation(config_name, translation_key)
     
     def search_similar_translations(self, config_name: str, source_text: str, threshold: float, n_results: int = 3) -> List[Dict]:
         """搜索相似翻译，使用向量数据库进行语义搜索，然后用 SQLite 验证数据一致性"""
+        return self.search_similar_translations_batch(config_name, [source_text], threshold, n_results)[0]
+    
+    def search_similar_translations_batch(self, config_name: str, source_texts: List[str], threshold: float, n_results: int = 3) -> List[List[Dict]]:
+        """批量搜索相似翻译，一次向量查询 + 一次 SQLite 查询，结果与 source_texts 一一对应"""
         # 1. 使用向量数据库进行语义搜索
-        vector_results = self.vector_memory.search_similar_translations(config_name, source_text, threshold, n_results)
+        vector_results_list = self.vector_memory.search_similar_translations_batch(config_name, source_texts, threshold, n_results)
+        
+        # 2. 根据 translation_key 在 SQLite 中一次性批量获取完整数据并验证
+        translation_keys = {
+            result.get('translation_key', '')
+            for vector_results in vector_results_list
+            for result in vector_results
+        }
+        translation_keys.discard('')
+        sqlite_objs = self.sqlite_memory.get_translations_by_keys(config_name, list(translation_keys))
         
-        # 2. 根据 translation_key 在 SQLite 中验证和获取完整数据
+        return [
+            self._verify_similar_results(config_name, vector_results, sqlite_objs)
+            for vector_results in vector_results_list
+        ]
+    
+    def _verify_similar_results(self, config_name: str, vector_results: List[Dict], sqlite_objs: Dict[str, TranslationObject]) -> List[Dict]:
+        """用 SQLite 中的记录校验并补全向量搜索结果，保持向量搜索的相似度顺序"""
         verified_results = []
         for result in vector_results:
             translation_key = result.get('translation_key', '')
             if translation_key:
-                # 从 SQLite 获取完整数据
-                sqlite_obj = self.sqlite_memory.get_translation_by_key(config_name, translation_key)
+                sqlite_obj = sqlite_objs.get(translation_key)
                 if sqlite_obj:
                     # 检查数据一致性
-                    sqlite_dict = sqlite_obj.to_dict()
                     vector_source = result.get('source', '')
-                    sqlite_source = sqlite_dict.get('original_text', '')
+                    sqlite_source = sqlite_obj.original_text
                     
                     if vector_source != self.vector_memory.escape_text(sqlite_source):
                         # 数据不一致，用 SQLite 数据同步向量数据库
@@ -173,14 +386,14 @@ class DatabaseInterface:
                     # 使用 SQLite 中的数据构造返回结果
                     verified_results.append({
                         'type': 'similar',
-                        'source': sqlite_dict.get('original_text', ''),
-                        'target': sqlite_dict.get('translation', ''),
-                        'context': sqlite_dict.get('context', ''),
-                        'file_path': sqlite_dict.get('file_name', ''),
+                        'source': sqlite_source,
+                        'target': sqlite_obj.translation,
+                        'context': sqlite_obj.context,
+                        'file_path': sqlite_obj.file_name,
                         'similarity': result.get('similarity', 0.0),
-                        'created_at': sqlite_dict.get('created_at', ''),
-                        'approved': sqlite_dict.get('approved', False),
-                        'approved_text': sqlite_dict.get('approved_text', ''),
+                        'created_at': '',
+                        'approved': sqlite_obj.approved,
+                        'approved_text': sqlite_obj.approved_text,
                         'translation_key': translation_key
                     })
                 else:
@@ -198,8 +411,11 @@ class DatabaseInterface:
         """删除翻译记录"""
         # 先从 SQLite 删除
         sqlite_success = self.sqlite_memory.delete_translation(config_name, translation_key)
+        self._invalidate_translation_cache(config_name, (translation_key,))
         
         # 再从向量数据库删除
+        self._discard_vector_pending(config_name, (translation_key,))
+        self._flush_vector_queue()
         vector_success = self.vector_memory.delete_translation_history(config_name, translation_key)
         
         if sqlite_success and not vector_success:
@@ -222,8 +438,11 @@ class DatabaseInterface:
         
         # 先从 SQLite 批量删除
         sqlite_success_count, sqlite_error_count = self.sqlite_memory.delete_translation_batch(config_name, translation_keys)
+        self._invalidate_translation_cache(config_name, translation_keys)
         
         # 再从向量数据库批量删除
+        self._discard_vector_pending(config_name, translation_keys)
+        self._flush_vector_queue()
         vector_success_count, vector_error_count = self.vector_memory.delete_translation_batch(config_name, translation_keys)
         
         errors = []
@@ -247,20 +466,18 @@ class DatabaseInterface:
         error_count = 0
         
         try:
-            # 获取 SQLite 中的所有记录
-            all_translations = self.sqlite_memory.search_translations(config_name, {})
+            self._flush_vector_queue()
             
-            for record in all_translations:
-                translation_obj = record['translation_obj']
-                translation_key = translation_obj.translation_key
-                
+            # 分批流式读取 SQLite 记录并批量写入向量数据库，避免一次性载入整张表
+            for batch in self.sqlite_memory.iter_translations(config_name):
                 try:
-                    # 更新向量数据库中的对应记录
-                    self.vector_memory.update_history_translation(config_name, translation_key, translation_obj)
-                    synced_count += 1
+                    # 原文未变化的记录沿用已持久化的向量，不必每次同步都重新嵌入整个语料
+                    success, errors = self.vector_memory.update_history_translation_batch(config_name, batch, only_changed=True)
+                    synced_count += success
+                    error_count += errors
                 except Exception as e:
-                    logger.error(f"同步记录失败 {translation_key}: {e}")
-                    error_count += 1
+                    logger.error(f"同步记录批次失败: {e}")
+                    error_count += len(batch)
             
             logger.info(f"数据同步完成: 成功 {synced_count}, 失败 {error_count}")
             
@@ -282,10 +499,17 @@ class DatabaseInterface:
         """
         if not translation_objects:
             return 0, 0, []
-    
+        
+        # 向量数据库只存原文，更新前先取出已有原文，之后只重新嵌入原文变化或新增的记录
+        existing_texts = {}
+        if update_vector:
+            existing_texts = self.sqlite_memory.get_original_texts_by_keys(
+                config_name, [obj.translation_key for obj in translation_objects]
+            )
         
         # 先批量更新 SQLite（主要数据存储）
         sqlite_success_count, sqlite_error_count = self.sqlite_memory.update_translation_batch(config_name, translation_objects)
+        self._invalidate_translation_cache(config_name, (obj.translation_key for obj in translation_objects))
         
         errors = []
         if sqlite_error_count > 0:
@@ -294,11 +518,23 @@ class DatabaseInterface:
         vector_success_count = 0
         vector_error_count = 0
         
+        changed_objects = [
+            obj for obj in translation_objects
+            if existing_texts.get(obj.translation_key) != obj.original_text
+        ]
+        
         # 如果需要更新向量数据库
-        if update_vector:
+        if update_vector and not changed_objects:
+            logger.info(f"批量更新完成: SQLite成功 {sqlite_success_count} (原文未变化，跳过向量数据库)")
+        elif update_vector and self._bulk_mode:
+            # 批量导入模式下推迟到退出该模式时统一同步
+            self._mark_vector_pending(config_name, (obj.translation_key for obj in changed_objects))
+            logger.info(f"批量更新完成: SQLite成功 {sqlite_success_count} (向量数据库待批量同步 {len(changed_objects)} 条)")
+        elif update_vector:
             try:
                 # 使用批量更新方法
-                vector_success_count, vector_error_count = self.vector_memory.update_history_translation_batch(config_name, translation_objects)
+                self._flush_vector_queue()
+                vector_success_count, vector_error_count = self.vector_memory.update_history_translation_batch(config_name, changed_objects)
                 
                 if vector_error_count > 0:
                     errors.append(f"向量数据库更新失败 {vector_error_count} 条记录")
@@ -20,15 +20,16 @@ along with ss_translator.  If not, see <https://www.gnu.org/licenses/>.
 全局状态管理模块
 集中管理所有跨模块共享的变量和状态
 """
-from vector_translation_memory import VectorTranslationMemory
-from db_interface import DatabaseInterface
-from improved_translator import ImprovedTranslator
+import threading
+from typing import TYPE_CHECKING, Optional
 
-# 数据库操作统一接口（主要接口）
-db = DatabaseInterface()
+if TYPE_CHECKING:
+    from db_interface import DatabaseInterface
 
-# 向量数据库实例（保留兼容性）
-vdb = db.vector_memory
+# 数据库操作统一接口（主要接口），首次访问 global_values.db 时才初始化
+# 向量数据库实例 global_values.vdb（保留兼容性）同样按需创建，即 db.vector_memory
+_db: Optional["DatabaseInterface"] = None
+_db_lock = threading.Lock()
 
 # 当前选择的配置名称
 current_config_name = None
@@ -45,8 +46,28 @@ terminology_replacer = None
 def set_config(config_name):
     """设置当前配置并重置相关状态"""
     global current_config_name, translator
+    # 延迟导入，避免导入 global_values 时加载整个翻译器依赖链
+    from improved_translator import ImprovedTranslator
     
     current_config_name = config_name
     translator = ImprovedTranslator(config_name)
-    
-    
\ No newline at end of file
+
+
+def _get_db() -> "DatabaseInterface":
+    """获取数据库接口，首次调用时创建（打开向量库和 SQLite 的开销较大）"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                from db_interface import DatabaseInterface
+                _db = DatabaseInterface()
+    return _db
+
+
+def __getattr__(name):
+    """模块级延迟属性（PEP 562）：db / vdb 在首次访问时才初始化"""
+    if name == 'db':
+        return _get_db()
+    if name == 'vdb':
+        return _get_db().vector_memory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
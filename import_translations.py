@@ -17,9 +17,10 @@ import sys
 import json
 import argparse
 import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from typing import List
+from typing import Iterator, List
 import logging
 
 # 添加项目根目录到 Python 路径
@@ -29,6 +30,14 @@ sys.path.insert(0, str(project_root))
 from translation_object import TranslationObject
 from db_interface import DatabaseInterface
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 优先使用 orjson 解析，两者都可以直接接受 bytes
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -46,17 +55,18 @@ def find_jsonl_files(directory: Path) -> List[Path]:
     jsonl_files = []
     
     try:
-        # 递归查找所有 .jsonl 文件
-        for file_path in directory.rglob("*.jsonl"):
-            if file_path.is_file():
-                jsonl_files.append(file_path)
-                logger.info(f"发现 JSONL 文件: {file_path}")
-        
-        # 也查找 .temp_translation.jsonl 文件
-        for file_path in directory.rglob("*.temp_translation.jsonl"):
-            if file_path.is_file() and file_path not in jsonl_files:
-                jsonl_files.append(file_path)
-                logger.info(f"发现临时翻译文件: {file_path}")
+        # 单次遍历目录树查找所有 .jsonl 文件（已包含 .temp_translation.jsonl）
+        pending = [str(directory)]
+        while pending:
+            current = pending.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith('.jsonl') and entry.is_file():
+                        file_path = Path(entry.path)
+                        jsonl_files.append(file_path)
+                        logger.info(f"发现 JSONL 文件: {file_path}")
                 
     except Exception as e:
         logger.error(f"扫描目录失败 {directory}: {e}")
@@ -64,12 +74,12 @@ def find_jsonl_files(directory: Path) -> List[Path]:
     return jsonl_files
 
 
-def load_translations_from_jsonl(file_path: Path) -> List[TranslationObject]:
-    """从 JSONL 文件加载翻译数据"""
-    translations = []
+def _iter_jsonl_records(file_path: Path) -> Iterator[TranslationObject]:
+    """逐行解析 JSONL 文件，逐条产出 TranslationObject"""
+    loaded_count = 0
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb') as f:
             for line_num, line in enumerate(f, 1):
                 line = line.strip()
                 if not line:
@@ -77,37 +87,75 @@ def load_translations_from_jsonl(file_path: Path) -> List[TranslationObject]:
                 
                 try:
                     # 解析 JSON 数据
-                    record = json.loads(line)
+                    record = _json_loads(line)
                     
                     # 创建 TranslationObject
                     translation_obj = TranslationObject.from_dict(record)
                     
                     # 确保有 translation_key
                     if not translation_obj.translation_key:
-                        # 生成新的 translation_key
-                        source_text = translation_obj.original_text
-                        file_name = translation_obj.file_name or str(file_path.name)
-                        translation_key = hashlib.md5(
-                            (source_text + file_name + str(datetime.now())).encode('utf-8')
+                        # 由原文和文件名生成确定的 translation_key，重复导入时命中同一条记录
+                        file_name = translation_obj.file_name or file_path.name
+                        translation_key = hashlib.blake2b(
+                            f"{translation_obj.original_text}\0{file_name}".encode('utf-8'), digest_size=16
                         ).hexdigest()
                         translation_obj.translation_key = translation_key
                         logger.debug(f"为记录生成新的 translation_key: {translation_key}")
                     
-                    translations.append(translation_obj)
-                    
                 except json.JSONDecodeError as e:
                     logger.warning(f"跳过无效的 JSON 行 {file_path}:{line_num}: {e}")
                     continue
                 except Exception as e:
                     logger.error(f"处理记录失败 {file_path}:{line_num}: {e}")
                     continue
+                
+                loaded_count += 1
+                yield translation_obj
         
-        logger.info(f"从文件 {file_path} 加载了 {len(translations)} 条翻译记录")
+        logger.info(f"从文件 {file_path} 加载了 {loaded_count} 条翻译记录")
         
     except Exception as e:
         logger.error(f"读取文件失败 {file_path}: {e}")
+
+
+def load_translations_from_jsonl(file_path: Path) -> List[TranslationObject]:
+    """从 JSONL 文件加载翻译数据"""
+    return list(_iter_jsonl_records(file_path))
+
+
+def iter_translations(file_path: Path, batch_size: int = 500) -> Iterator[List[TranslationObject]]:
+    """流式读取 JSONL 文件，每凑满 batch_size 条产出一批，内存占用只与批大小相关"""
+    batch = []
+    for translation_obj in _iter_jsonl_records(file_path):
+        batch.append(translation_obj)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _split_batches(translations: List[TranslationObject], batch_size: int) -> Iterator[List[TranslationObject]]:
+    """将已加载的翻译列表按 batch_size 切分"""
+    for i in range(0, len(translations), batch_size):
+        yield translations[i:i + batch_size]
+
+
+def _load_files_in_pool(executor: ProcessPoolExecutor, jsonl_files: List[Path], workers: int) -> Iterator[List[TranslationObject]]:
+    """
+    在进程池中解析 JSONL 文件并按原顺序产出结果
     
-    return translations
+    最多同时提交 workers 个文件，取走一个结果后才提交下一个文件，内存中最多保留 workers 个文件的解析结果
+    """
+    files = iter(jsonl_files)
+    pending = deque(executor.submit(load_translations_from_jsonl, file_path)
+                    for _, file_path in zip(range(workers), files))
+    while pending:
+        translations = pending.popleft().result()
+        next_file = next(files, None)
+        if next_file is not None:
+            pending.append(executor.submit(load_translations_from_jsonl, next_file))
+        yield translations
 
 
 def import_translations_to_database(config_name: str, translations: List[TranslationObject], 
@@ -140,7 +188,8 @@ def main():
     parser.add_argument('mod_path', help='包含 JSONL 文件的模组目录路径')
     parser.add_argument('config_name', help='目标配置名称（不包含 .json 后缀）')
     parser.add_argument('--no-vector', action='store_true', help='跳过向量数据库更新（仅更新 SQLite）')
-    parser.add_argument('--batch-size', type=int, default=100, help='批量处理大小（默认 100）')
+    parser.add_argument('--batch-size', type=int, default=500, help='批量处理大小（默认 500）')
+    parser.add_argument('--workers', type=int, default=None, help='并行解析 JSONL 文件的进程数（默认 CPU 核数）')
     
     args = parser.parse_args()
     
@@ -164,6 +213,8 @@ def main():
     logger.info(f"  更新向量数据库: {update_vector}")
     logger.info(f"  批量大小: {batch_size}")
     
+    executor = None
+    
     # 初始化数据库接口
     try:
         db_interface = DatabaseInterface("hybrid_memory")
@@ -182,6 +233,10 @@ def main():
         
         logger.info(f"找到 {len(jsonl_files)} 个 JSONL 文件")
         
+        # 导入期间只写 SQLite，结束后统一同步向量数据库
+        if update_vector:
+            db_interface.bulk_mode(True)
+        
         # 统计信息
         total_files = len(jsonl_files)
         total_translations = 0
@@ -189,46 +244,43 @@ def main():
         total_errors = 0
         processed_files = 0
         
+        # 解析是纯 CPU 工作，多个文件时交给进程池并行解析；
+        # 写入仍由主进程按文件原顺序串行执行（SQLite 只允许一个写者）
+        workers = min(args.workers or os.cpu_count() or 1, total_files)
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            file_batches = (
+                _split_batches(translations, batch_size)
+                for translations in _load_files_in_pool(executor, jsonl_files, workers)
+            )
+            logger.info(f"使用 {workers} 个进程并行解析 JSONL 文件")
+        else:
+            # 单进程时边读边写，不把整个文件载入内存
+            file_batches = (iter_translations(file_path, batch_size) for file_path in jsonl_files)
+        
         # 处理每个文件
-        for file_path in jsonl_files:
+        for file_path, batches in zip(jsonl_files, file_batches):
             logger.info(f"处理文件 [{processed_files + 1}/{total_files}]: {file_path.relative_to(mod_path)}")
             
-            # 加载翻译数据
-            translations = load_translations_from_jsonl(file_path)
-            total_translations += len(translations)
-            
-            if not translations:
-                logger.warning(f"文件 {file_path} 中没有有效的翻译记录")
-                processed_files += 1
-                continue
-            
-            # 分批处理大文件
-            if len(translations) > batch_size:
-                logger.info(f"文件包含 {len(translations)} 条记录，将分批处理（每批 {batch_size} 条）")
+            file_translations = 0
+            for batch_num, batch in enumerate(batches, 1):
+                logger.info(f"  处理批次 {batch_num} ({len(batch)} 条记录)")
                 
-                for i in range(0, len(translations), batch_size):
-                    batch = translations[i:i + batch_size]
-                    batch_num = i // batch_size + 1
-                    total_batches = (len(translations) + batch_size - 1) // batch_size
-                    
-                    logger.info(f"  处理批次 {batch_num}/{total_batches} ({len(batch)} 条记录)")
-                    
-                    success_count, error_count, errors = import_translations_to_database(
-                        config_name, batch, db_interface, update_vector
-                    )
-                    
-                    total_success += success_count
-                    total_errors += error_count
-            else:
-                # 小文件直接处理
                 success_count, error_count, errors = import_translations_to_database(
-                    config_name, translations, db_interface, update_vector
+                    config_name, batch, db_interface, update_vector
                 )
                 
+                file_translations += len(batch)
                 total_success += success_count
                 total_errors += error_count
             
+            total_translations += file_translations
             processed_files += 1
+            
+            if not file_translations:
+                logger.warning(f"文件 {file_path} 中没有有效的翻译记录")
+                continue
+            
             logger.info(f"文件 {file_path.name} 处理完成")
         
         # 输出最终统计
@@ -250,7 +302,10 @@ def main():
         logger.error(f"导入过程发生错误: {e}")
         sys.exit(1)
     finally:
-        # 关闭数据库连接
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        
+        # 关闭数据库连接（批量导入模式下会先同步向量数据库）
         try:
             db_interface.close()
             logger.info("数据库连接已关闭")
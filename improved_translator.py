@@ -20,26 +20,74 @@ along with ss_translator.  If not, see <https://www.gnu.org/licenses/>.
 改进的翻译器 - 负责LLM调用和翻译流程管理
 分离关注点，使用helper类处理不同文件类型的具体逻辑
 """
+import asyncio
+import hashlib
+import importlib.util
 import json5
 import json
 import logging
 import os
+import queue
 import shutil
 import threading
+import weakref
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 import time
 import traceback
 from typing import Dict, List, Any, Optional, Tuple
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx 启用 HTTP/2 需要 h2，只检查是否安装，不导入
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 from translation_object import TranslationObject
 from translate_helper.translate_helper_base import TranslateHelper
-from config_manager import config_manager
+from config_manager import get_config_manager
 from progress_manager import ProgressManager
 import global_values
 import re
 
 
+# 并发翻译时，每次为多少个连续的翻译对象批量预取相似翻译和专有名词
+_PREFETCH_WINDOW = 64
+
+# 需要替换为 ${n} 的占位符：除换行/回车外的控制字符、%s/%d/%1 等百分号占位符、直到空白为止的 $ 变量
+_PLACEHOLDER_RE = re.compile(r'[\x00-\x09\x0b\x0c\x0e-\x1f]|%[0-9sdxfv]|\$[^ \n\r]*')
+
+# 译文标点修正：弯引号统一为直引号，英文逗号替换为中文逗号
+_PUNCT_TABLE = str.maketrans({"”": "\"", "“": "\"", "’": "'", "‘": "'", ",": "，"})
+
+# LLM 译文中的 ${n} 占位符
+_PLACEHOLDER_REF_RE = re.compile(r'\$\{\d+\}')
+
+# 不含任何文字（字母、汉字等）的文本，例如纯数字编号、标点、多个占位符的组合
+_NO_LETTERS_RE = re.compile(r'[\W\d_]*')
+
+# 临时翻译文件攒够多少行或距上次写入多少秒后写入一次
+_TEMP_FLUSH_LINES = 32
+_TEMP_FLUSH_INTERVAL = 1.0
+
+# 等待写入线程处理的批次上限
+_WRITE_QUEUE_SIZE = 256
+
+# 优先使用 orjson 解析LLM响应
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# 匹配 "translation": "..." 的模式，考虑到值中可能包含引号
+_TRANSLATION_FIELD_RE = re.compile(r'"translation"\s*:\s*"(.*?)",\s*"should_translate"', re.DOTALL)
+
+# 进程内 LLM 翻译结果缓存的最大条目数
+_EXACT_CACHE_SIZE = 8192
+
+
 class InterruptedError(Exception):
     """自定义异常，用于处理翻译中断"""
     pass
@@ -59,7 +107,7 @@ class ImprovedTranslator:
         self.config_name = config_name
         
         # 从config_manager加载配置
-        self.config = config_manager.load_config(config_name)
+        self.config = get_config_manager().load_config(config_name)
         
         
         self.work_dir, self.mod_path, self.mod_work_dir = TranslateHelper.init_workspace(self.config)
@@ -78,6 +126,13 @@ class ImprovedTranslator:
         self.logger.info(f"初始化改进翻译器，配置: {config_name}")
         self.client = None
         
+        # LLM 翻译结果缓存：处理占位符后的文本完全相同时直接复用，跳过向量搜索和LLM调用
+        self._exact_cache: "OrderedDict[bytes, Tuple[str, bool, str]]" = OrderedDict()
+        self._exact_cache_lock = threading.Lock()
+        
+        # 文件名 -> (文件类型, 构建提示词用的helper, 系统提示词)，同一文件的所有翻译对象共用
+        self._prompt_helpers: Dict[str, Tuple[str, Optional[TranslateHelper], str]] = {}
+        
     def _init_llm_api(self):
         print("Initializing LLM API...")
         if self.config["api_key"] == "your_api_key_here":
@@ -107,15 +162,30 @@ class ImprovedTranslator:
         # 清除已有的处理器
         self.logger.handlers.clear()
         
-        # 添加文件处理器
+        # 文件处理器
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        self.logger.addHandler(file_handler)
         
-        # 添加控制台处理器
+        # 控制台处理器
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        self.logger.addHandler(console_handler)
+        
+        # 翻译过程中只把日志记录放入队列，由后台线程统一格式化并写入文件和控制台
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(log_queue))
+        self._log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        self._log_listener.start()
+        
+        # 实例被回收或进程退出时写完剩余日志并关闭日志文件
+        weakref.finalize(self, ImprovedTranslator._stop_logging, self._log_listener, self.logger)
+    
+    @staticmethod
+    def _stop_logging(listener: QueueListener, logger: logging.Logger):
+        """停止日志后台线程并关闭处理器"""
+        logger.handlers.clear()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
 
     
     def extract_translate_objects(self, file_path: str) -> List[TranslationObject]:
@@ -137,16 +207,67 @@ class ImprovedTranslator:
         """
         翻译单个文本对象
         """
-        if not translation_obj.original_text or not translation_obj.original_text.strip():
+        prepared = self._prepare_llm_request(translation_obj, self.client, db)
+        if prepared is None:
+            return translation_obj
+        request_args, processed_text, placeholders_map = prepared
+        
+        # 调用LLM
+        max_retries = self.config.get("max_retries", 3)
+        for attempt in range(max_retries):
+            try:
+                response = self.client.chat.completions.create(**request_args)
+                message = response.choices[0].message.content
+                if self._apply_llm_response(translation_obj, message, attempt, max_retries, processed_text, placeholders_map, db):
+                    return translation_obj
+            except Exception as e:
+                self._handle_llm_error(translation_obj, e, attempt, max_retries)
+        
+        return translation_obj
+    
+    async def _atranslate_text(self, aclient, translation_obj: TranslationObject, db = None,
+                               prefetched: Optional[Tuple[List[Dict], List[Dict]]] = None) -> TranslationObject:
+        """
+        translate_text 的异步版本，LLM 请求通过 AsyncOpenAI 发出，便于同时进行多个请求
+        
+        prefetched 为预先批量查询好的 (相似翻译, 专有名词)，提供时不再单独查询向量数据库
+        """
+        prepared = self._prepare_llm_request(translation_obj, aclient, db, prefetched)
+        if prepared is None:
             return translation_obj
+        request_args, processed_text, placeholders_map = prepared
+        
+        # 调用LLM
+        max_retries = self.config.get("max_retries", 3)
+        for attempt in range(max_retries):
+            try:
+                response = await aclient.chat.completions.create(**request_args)
+                message = response.choices[0].message.content
+                if self._apply_llm_response(translation_obj, message, attempt, max_retries, processed_text, placeholders_map, db):
+                    return translation_obj
+            except Exception as e:
+                self._handle_llm_error(translation_obj, e, attempt, max_retries)
+        
+        return translation_obj
+    
+    def _prepare_llm_request(self, translation_obj: TranslationObject, client, db = None,
+                             prefetched: Optional[Tuple[List[Dict], List[Dict]]] = None) -> Optional[Tuple[Dict[str, Any], str, Dict[str, str]]]:
+        """
+        处理翻译记忆、占位符等无需调用LLM的情况，并构建LLM请求参数
+        
+        Returns:
+            (请求参数, 处理后的文本, 占位符映射)；如果翻译对象已经处理完毕则返回None
+        """
+        if not translation_obj.original_text or not translation_obj.original_text.strip():
+            return None
         
         # 检查是否有完全匹配的翻译记忆
         if self.db_interface:
-            # 优先使用translation_key查询
+            # 优先使用translation_key查询（不传入共享连接，查询结果可以进入翻译记录缓存）
             exact_match_obj = None
             key_match = True
             if translation_obj.translation_key:
-                exact_match_obj = self.db_interface.get_exact_translation(self.config_name, translation_key=translation_obj.translation_key, db = db)
+                exact_match_obj = self.db_interface.get_exact_translation(self.config_name, translation_key=translation_obj.translation_key)
             
             # 如果没有通过translation_key找到，再用原文查询
             if not exact_match_obj:
@@ -170,7 +291,7 @@ class ImprovedTranslator:
                         save_obj,
                         db
                     )
-                return translation_obj
+                return None
             
         processed_text, placeholders_map = self.process_text_placeholder(translation_obj.original_text)
         
@@ -183,7 +304,15 @@ class ImprovedTranslator:
             translation_obj.is_suggested_to_translate = False
             translation_obj.is_translated = True
             translation_obj.llm_reason = "纯占位符文本，无需翻译"
-            return translation_obj
+            return None
+        if _NO_LETTERS_RE.fullmatch(processed_text):
+            # 只有数字、标点、空白和占位符，不含任何文字，无需查询相似翻译或调用LLM
+            self.logger.debug(f"文本不含文字，跳过翻译: {processed_text[:50]}")
+            translation_obj.translation = translation_obj.original_text
+            translation_obj.is_suggested_to_translate = False
+            translation_obj.is_translated = True
+            translation_obj.llm_reason = "文本不含文字，无需翻译"
+            return None
         # 长度大于4000的不翻译, 容易出错
         if len(processed_text) > 4000:
             self.logger.warning(f"文本长度超过4000字符，跳过翻译: {processed_text[:50]}...")
@@ -191,131 +320,357 @@ class ImprovedTranslator:
             translation_obj.is_translated = False
             translation_obj.is_suggested_to_translate = False
             translation_obj.llm_reason = "文本长度超过4000字符，跳过翻译"
-            return translation_obj
+            return None
         
-        # 搜索相似的历史翻译
+        # 处理后的文本之前已由LLM翻译过（如重复的界面字符串），直接复用结果
+        cache_key = self._exact_cache_key(translation_obj, processed_text)
+        cached = self._get_exact_cache(cache_key)
+        if cached is not None:
+            self.logger.info(f"命中翻译结果缓存: {translation_obj.original_text[:50]}")
+            try:
+                self._finish_translation(translation_obj, *cached, processed_text, placeholders_map, db)
+                return None
+            except ValueError as e:
+                # 缓存的译文不适用于当前占位符，丢弃缓存条目，改为调用LLM
+                self.logger.warning(f"缓存的翻译结果无效，重新调用LLM: {e}")
+                self._drop_exact_cache(cache_key)
+        
+        # 搜索相似的历史翻译和文本中的专有名词（已批量预取时直接使用）
         similar_translations = []
-        if self.db_interface:
+        found_terms = []
+        if prefetched is not None:
+            similar_translations, found_terms = prefetched
+        elif self.db_interface:
             similar_translations = self.db_interface.search_similar_translations(
                 self.config_name, translation_obj.original_text, n_results=3, threshold=0.7
             )
-        self.logger.info(f"找到以下相似翻译: {similar_translations}")
-        # 搜索文本中的专有名词
-        found_terms = []
-        if self.db_interface:
             found_terms = self.db_interface.search_terminology(translation_obj.original_text)
+        self.logger.info(f"找到以下相似翻译: {similar_translations}")
         
         self.logger.info(f"找到以下专有名词: {found_terms}")
         # 获取文件类型对应的helper
-        file_type = TranslateHelper.get_file_type(translation_obj.file_name, self.config)
-        helper = TranslateHelper.get_helper_by_file_type(file_type, self.logger, self.config)
+        file_type, helper, system_prompt = self._get_prompt_helper(translation_obj.file_name)
         
         if not helper:
             self.logger.error(f"找不到文件类型 {file_type} 的helper")
-            return translation_obj
+            return None
         
-        # 构建提示词
-        system_prompt = helper.get_llm_system_prompt()
+        # 构建提示词（系统提示词每个文件只生成一次，每次请求发送完全相同的前缀，便于服务端命中提示词缓存）
         user_prompt = helper.get_llm_user_prompt(translation_obj, similar_translations, found_terms)
         
-        # 调用LLM
-        max_retries = self.config.get("max_retries", 3)
-        
-        if not self.client:
+        if not client:
             self.logger.error("LLM客户端未初始化")
             translation_obj.llm_reason = "LLM客户端未初始化"
             translation_obj.is_translated = False
             translation_obj.is_suggested_to_translate = False
             translation_obj.translation = translation_obj.original_text
-            return translation_obj
+            return None
+        
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        request_args = {
+            "model": self.config.get("model", "deepseek-chat"),
+            "messages": messages,
+            "temperature": self.config.get("temperature", 0.3),
+            "max_tokens": self.config.get("max_tokens", 8000),
+            "response_format": {'type': 'json_object'}
+        }
+        return request_args, processed_text, placeholders_map
+    
+    def _needs_similar_lookup(self, translation_obj: TranslationObject) -> bool:
+        """
+        预取相似翻译前的廉价检查：完全匹配的翻译记忆、纯占位符、不含文字的文本、超长文本和已缓存的结果
+        都会在调用LLM前提前返回，不需要查询向量数据库
+        """
+        if not translation_obj.original_text or not translation_obj.original_text.strip():
+            return False
+        if self.db_interface:
+            if translation_obj.translation_key and self.db_interface.get_exact_translation(
+                    self.config_name, translation_key=translation_obj.translation_key):
+                return False
+            if self.db_interface.get_exact_translation(self.config_name, source_text=translation_obj.original_text):
+                return False
+        processed_text, _ = self.process_text_placeholder(translation_obj.original_text)
+        if processed_text == "${1}" or _NO_LETTERS_RE.fullmatch(processed_text) or len(processed_text) > 4000:
+            return False
+        return self._get_exact_cache(self._exact_cache_key(translation_obj, processed_text)) is None
+    
+    def _get_prompt_helper(self, file_name: str) -> Tuple[str, Optional[TranslateHelper], str]:
+        """
+        获取文件对应的文件类型、helper和系统提示词，按文件名缓存，避免每个翻译对象都重新创建helper
         
-        for attempt in range(max_retries):
+        缓存的helper只用于构建提示词；提取和应用翻译时helper会保存中间状态，仍然每次单独创建
+        """
+        cached = self._prompt_helpers.get(file_name)
+        if cached is None:
+            file_type = TranslateHelper.get_file_type(file_name, self.config)
+            helper = TranslateHelper.get_helper_by_file_type(file_type, self.logger, self.config)
+            system_prompt = helper.get_llm_system_prompt() if helper else ""
+            cached = (file_type, helper, system_prompt)
+            self._prompt_helpers[file_name] = cached
+        return cached
+    
+    def _exact_cache_key(self, translation_obj: TranslationObject, processed_text: str) -> bytes:
+        """缓存键：文件类型和上下文会影响提示词，与处理后的文本一起参与哈希"""
+        file_type = self._get_prompt_helper(translation_obj.file_name)[0]
+        return hashlib.blake2b(
+            f"{file_type}\0{translation_obj.context}\0{processed_text}".encode('utf-8'), digest_size=16
+        ).digest()
+    
+    def _get_exact_cache(self, cache_key: bytes) -> Optional[Tuple[str, bool, str]]:
+        """查询LLM翻译结果缓存，返回 (LLM原始译文, 是否建议翻译, 原因)"""
+        with self._exact_cache_lock:
+            cached = self._exact_cache.get(cache_key)
+            if cached is not None:
+                self._exact_cache.move_to_end(cache_key)
+            return cached
+    
+    def _put_exact_cache(self, cache_key: bytes, result: Tuple[str, bool, str]):
+        """写入LLM翻译结果缓存，超出容量时淘汰最久未使用的条目"""
+        with self._exact_cache_lock:
+            self._exact_cache[cache_key] = result
+            self._exact_cache.move_to_end(cache_key)
+            if len(self._exact_cache) > _EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+    
+    def _drop_exact_cache(self, cache_key: bytes):
+        """删除LLM翻译结果缓存中的条目"""
+        with self._exact_cache_lock:
+            self._exact_cache.pop(cache_key, None)
+    
+    def _apply_llm_response(self, translation_obj: TranslationObject, message: str, attempt: int, max_retries: int,
+                            processed_text: str, placeholders_map: Dict[str, str], db = None) -> bool:
+        """
+        解析LLM响应并写回翻译对象
+        
+        Returns:
+            True 表示翻译对象已处理完毕；False 表示响应无法解析，需要重试
+        """
+        # 解析JSON响应
+        result = {}
+        try:
             try:
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ]
-                
-                response = self.client.chat.completions.create(
-                    model=self.config.get("model", "deepseek-chat"),
-                    messages=messages, # type: ignore
-                    temperature=self.config.get("temperature", 0.3),
-                    max_tokens=self.config.get("max_tokens", 8000),
-                    response_format={'type': 'json_object'}
-                )
-
-                # self.logger.info(f"temperature:{self.config.get('temperature', 0.3)}, max_tokens:{self.config.get('max_tokens', 8000)}")
-                
-                message = response.choices[0].message.content
-                
-                # 解析JSON响应
-                result = {}
-                try:
-                    # 尝试直接解析
-                    result = json5.loads(message) # type: ignore
-                    
-                except Exception as json_error:
-                    # 如果直接解析失败，尝试修复JSON
-                    
-                    self.logger.warning(f"解析LLM响应失败 (尝试 {attempt + 1})")
-                    if attempt == max_retries - 1:
-                        # 最后一次尝试，尝试提取纯文本作为翻译结果
-                        translation_obj.translation = message # type: ignore
-                        translation_obj.is_translated = True
-                        translation_obj.is_suggested_to_translate = False
-                        translation_obj.llm_reason = "LLM响应格式不正确，此为原始响应"
-                        return translation_obj
-                    continue
-
-
-                org_translation = result.get("translation", "")
-                should_translate = result.get("should_translate", True)
-                reason = result.get("reason", "")
-                
-                translation = org_translation
-                # 恢复占位符
-                if org_translation and placeholders_map:
-                    translation = self.validate_placeholders_and_parse(translation, placeholders_map)
+                # 使用了 json_object 响应格式，绝大多数响应是标准JSON，先走快速解析
+                result = _json_loads(message) # type: ignore
+            except ValueError:
+                # 标准解析失败时再用更宽松的 json5 解析
+                result = json5.loads(message) # type: ignore
+        
+        except Exception as json_error:
+            # 如果直接解析失败，尝试修复JSON
+            
+            self.logger.warning(f"解析LLM响应失败 (尝试 {attempt + 1})")
+            if attempt == max_retries - 1:
+                # 最后一次尝试，尝试提取纯文本作为翻译结果
+                translation_obj.translation = message # type: ignore
+                translation_obj.is_translated = True
+                translation_obj.is_suggested_to_translate = False
+                translation_obj.llm_reason = "LLM响应格式不正确，此为原始响应"
+                return True
+            return False
 
-                if translation_obj.context == "script":
-                    # csv script字段的特殊处理
-                    for i in range(len(translation)):
-                        char = translation[i]
-                        if ord(char) == 0x00a:  # '\n'
-                            translation = translation.replace(char, '\n')
 
-                # 将响应内容里的英文引号替换为中文引号
-                translation = translation.replace("”", "\"").replace("’", "\'").replace("“", "\"").replace("‘", "\'").replace(",", "，")
-                
-                translation_obj.translation = translation
-                translation_obj.is_translated = bool(translation)
-                translation_obj.is_suggested_to_translate = should_translate
-                translation_obj.llm_reason = reason
-                
-                # 如果翻译成功，保存到翻译记忆库
-                if translation and self.db_interface and translation_obj.is_translated:
-                    # 创建用于保存的翻译对象副本
-                    save_obj = translation_obj.copy()
-                    save_obj.process_text = processed_text
-                    save_obj.translation = translation
-                    translation_id = self.db_interface.add_translation_history(
-                        self.config_name,
-                        save_obj,
-                        db
-                    )
+        org_translation = result.get("translation", "")
+        should_translate = result.get("should_translate", True)
+        reason = result.get("reason", "")
+        
+        self._finish_translation(translation_obj, org_translation, should_translate, reason, processed_text, placeholders_map, db)
+        # 占位符校验通过后才缓存，避免缺失占位符的译文被其他文本复用
+        if org_translation:
+            self._put_exact_cache(
+                self._exact_cache_key(translation_obj, processed_text),
+                (org_translation, should_translate, reason)
+            )
+        return True
+    
+    def _finish_translation(self, translation_obj: TranslationObject, org_translation: str, should_translate: bool, reason: str,
+                            processed_text: str, placeholders_map: Dict[str, str], db = None):
+        """恢复占位符、修正标点，将译文写回翻译对象并保存到翻译记忆库"""
+        translation = org_translation
+        # 恢复占位符
+        if org_translation and placeholders_map:
+            translation = self.validate_placeholders_and_parse(translation, placeholders_map)
+        
+        # 将响应内容里的英文引号替换为中文引号
+        translation = translation.translate(_PUNCT_TABLE)
+        
+        translation_obj.translation = translation
+        translation_obj.is_translated = bool(translation)
+        translation_obj.is_suggested_to_translate = should_translate
+        translation_obj.llm_reason = reason
+        
+        # 如果翻译成功，保存到翻译记忆库
+        if translation and self.db_interface and translation_obj.is_translated:
+            # 创建用于保存的翻译对象副本
+            save_obj = translation_obj.copy()
+            save_obj.process_text = processed_text
+            save_obj.translation = translation
+            translation_id = self.db_interface.add_translation_history(
+                self.config_name,
+                save_obj,
+                db
+            )
+        
+        self.logger.info(f"翻译完成: {translation_obj.original_text[:50]}...")
+    
+    def _handle_llm_error(self, translation_obj: TranslationObject, error: Exception, attempt: int, max_retries: int):
+        """记录LLM调用失败，最后一次尝试仍失败时将翻译对象标记为失败"""
+        self.logger.error(f"LLM调用失败 (尝试 {attempt + 1}): {error}")
+        if attempt == max_retries - 1:
+            translation_obj.llm_reason = f"翻译失败: {str(error)}"
+            translation_obj.is_translated = False
+            translation_obj.is_suggested_to_translate = False
+            translation_obj.translation = translation_obj.original_text
+    
+    def _create_async_client(self) -> Optional[AsyncOpenAI]:
+        """创建异步LLM客户端，未配置LLM时返回None；异步客户端绑定当前事件循环"""
+        if not self.client:
+            return None
+        # 连接池大小与LLM请求并发上限一致，保持长连接，避免并发请求排队等待连接或重复握手；
+        # 超时与 openai 库默认值一致。客户端关闭时会一并关闭该连接池
+        concurrency = max(1, int(self.config.get("concurrency", 16)))
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=httpx.Timeout(600.0, connect=5.0),
+            http2=_HTTP2_AVAILABLE,
+            follow_redirects=True
+        )
+        return AsyncOpenAI(
+            api_key=self.config["api_key"], 
+            base_url=self.config.get("base_url", "https://api.deepseek.com"),
+            http_client=http_client
+        )
+    
+    def _create_request_semaphore(self) -> asyncio.Semaphore:
+        """限制同时进行的LLM请求数量"""
+        return asyncio.Semaphore(max(1, int(self.config.get("concurrency", 16))))
+    
+    async def _atranslate_objects(self, translate_objects: List[TranslationObject], start_index: int, file_path: str, f, db = None,
+                                  aclient = None, semaphore: Optional[asyncio.Semaphore] = None):
+        """
+        并发翻译 translate_objects[start_index:]，最多同时进行 concurrency 个LLM请求
+        
+        结果按原顺序写入临时文件并更新进度，保证中断后可以按已翻译数量续翻。
+        同时翻译多个文件时由调用方传入共享的 aclient 和 semaphore，使 concurrency 成为全局上限
+        """
+        total_count = len(translate_objects)
+        if semaphore is None:
+            semaphore = self._create_request_semaphore()
+        
+        # 未传入客户端时自行创建，并在结束时关闭
+        owns_client = aclient is None
+        if owns_client:
+            aclient = self._create_async_client()
+        
+        # 按窗口批量预取相似翻译和专有名词：一次向量查询代替每个对象各自查询，
+        # 同时窗口足够小，之前窗口中新翻译的内容仍能作为后续对象的参考。
+        # 只预取需要调用LLM的对象，嵌入和向量查询放到线程中执行，不阻塞事件循环
+        prefetch_tasks: Dict[int, asyncio.Future] = {}
+        
+        def prefetch_window(window_start: int) -> Dict[int, Tuple[List[Dict], List[Dict]]]:
+            indexes = [
+                i for i in range(window_start, min(window_start + _PREFETCH_WINDOW, total_count))
+                if self._needs_similar_lookup(translate_objects[i])
+            ]
+            if not indexes:
+                return {}
+            texts = [translate_objects[i].original_text for i in indexes]
+            similar_list = self.db_interface.search_similar_translations_batch(
+                self.config_name, texts, n_results=3, threshold=0.7
+            )
+            terms_list = self.db_interface.search_terminology_batch(texts)
+            return {i: (similar_translations, found_terms)
+                    for i, similar_translations, found_terms in zip(indexes, similar_list, terms_list)}
+        
+        async def get_prefetched(index: int) -> Optional[Tuple[List[Dict], List[Dict]]]:
+            if not self.db_interface:
+                return None
+            window_start = index - (index - start_index) % _PREFETCH_WINDOW
+            task = prefetch_tasks.get(window_start)
+            if task is None:
+                task = asyncio.ensure_future(asyncio.to_thread(prefetch_window, window_start))
+                prefetch_tasks[window_start] = task
+            # 同一窗口的其他对象也在等待这次预取，取消当前任务时不取消预取
+            window = await asyncio.shield(task)
+            return window.pop(index, None)
+        
+        async def translate_one(index: int):
+            async with semaphore:
+                if self.progress_manager.is_interrupted():
+                    raise InterruptedError("翻译被中断")
+                self.logger.info(f"翻译进度: {index + 1}/{total_count}")
+                prefetched = await get_prefetched(index)
+                return index, await self._atranslate_text(aclient, translate_objects[index], db, prefetched)
+        
+        # 临时翻译结果先在内存中攒批，再交给写入线程序列化并写入文件，磁盘IO不阻塞事件循环；
+        # 进度由写入线程在写入后增加，保证中断后记录的进度不会超过文件中实际保存的条数
+        pending_objects = []
+        last_flush = time.monotonic()
+        write_queue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        writer = threading.Thread(target=self._temp_file_writer, args=(f, write_queue, file_path), daemon=True)
+        writer.start()
+        
+        def flush_pending():
+            nonlocal last_flush
+            if pending_objects:
+                write_queue.put(pending_objects.copy())
+                pending_objects.clear()
+            last_flush = time.monotonic()
+        
+        tasks = [asyncio.create_task(translate_one(i)) for i in range(start_index, total_count)]
+        finished = {}
+        next_index = start_index
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, translated_obj = await next_done
+                finished[index] = translated_obj
                 
-                self.logger.info(f"翻译完成: {translation_obj.original_text[:50]}...")
-                return translation_obj
+                # 只写出从 next_index 开始连续完成的结果
+                while next_index in finished:
+                    translated_obj = finished.pop(next_index)
+                    translate_objects[next_index] = translated_obj
+                    
+                    # 保存临时翻译结果
+                    pending_objects.append(translated_obj)
+                    next_index += 1
                 
-            except Exception as e:
-                self.logger.error(f"LLM调用失败 (尝试 {attempt + 1}): {e}")
-                if attempt == max_retries - 1:
-                    translation_obj.llm_reason = f"翻译失败: {str(e)}"
-                    translation_obj.is_translated = False
-                    translation_obj.is_suggested_to_translate = False
-                    translation_obj.translation = translation_obj.original_text
+                if len(pending_objects) >= _TEMP_FLUSH_LINES or time.monotonic() - last_flush >= _TEMP_FLUSH_INTERVAL:
+                    flush_pending()
+        finally:
+            # 中断或出错时，已按顺序完成的结果仍然写入文件
+            flush_pending()
+            write_queue.put(None)
+            writer.join()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # 等待仍在线程中执行的预取结束
+            await asyncio.gather(*prefetch_tasks.values(), return_exceptions=True)
+            if owns_client and aclient:
+                await aclient.close()
+    
+    def _temp_file_writer(self, f, write_queue: queue.Queue, file_path: str):
+        """
+        写入线程：按顺序把每批翻译对象写入临时翻译文件并增加进度，收到 None 时退出
         
-        return translation_obj
+        某次写入失败后不再写入后续内容，避免文件中出现缺口导致续翻时进度错位
+        """
+        failed = False
+        while True:
+            item = write_queue.get()
+            if item is None:
+                break
+            if failed:
+                continue
+            try:
+                f.write(''.join(json.dumps(obj.to_dict(), ensure_ascii=False) + '\n' for obj in item))
+                f.flush()
+                self.progress_manager.increment_translation_progress(file_path, len(item))
+            except Exception as e:
+                failed = True
+                self.logger.error(f"写入临时翻译文件失败 {file_path}: {e}")
     
     def _fix_json_response(self, message: str) -> str:
         """
@@ -328,9 +683,7 @@ class ImprovedTranslator:
                 raise ValueError("不是有效的JSON格式")
             
             
-            # 匹配 "translation": "..." 的模式，考虑到值中可能包含引号
-            pattern = r'"translation"\s*:\s*"(.*?)",\s*"should_translate"'
-            match = re.search(pattern, message, re.DOTALL)
+            match = _TRANSLATION_FIELD_RE.search(message)
             
             if match:
                 translation_value = match.group(1)
@@ -376,43 +729,15 @@ class ImprovedTranslator:
         """
         将文本的占位符统一处理成LLM易读的${1}, ${2}格式
         """
-        result = text
-        placeholder_index = 1
         placeholders_map = {}
-#         "!$entity.patrolAllowTOff
-            # $entity.missileUseCaughtConv score:100
-            # !$entity.knowsWhoPlayerIs"
-
-        # 逐个字符检查并替换控制字符
-        for i in range(len(text)):
-            char = text[i]
-            if ord(char) == 0x00a:  # '\n'
-                result = result.replace(char, '\n')
-            elif ord(char) == 0x00d:  # '\r' # 略过这个, 没意义
-                result = result.replace(char, '\r')
-            elif ord(char) < 32:
-                # 找到控制字符，替换为${index}
-                placeholder = f"${{{placeholder_index}}}"
-                result = result.replace(char, placeholder, 1)
-                placeholder_index += 1
-                placeholders_map[placeholder] = char
-            elif char == '%' and (i + 1 < len(text) and (text[i + 1].isdigit() or text[i + 1] in ["s", "d", "x", "f", "v"])):
-                # 找到百分号占位符，替换为${index}
-                placeholder = f"${{{placeholder_index}}}"
-                result = result.replace(char + text[i + 1], placeholder, 1)
-                placeholder_index += 1
-                placeholders_map[placeholder] = char + text[i + 1]
-                i = i + 1  # 跳过下一个字符
-            elif char == '$':
-                # 寻找到空格为止
-                end_index = i + 1
-                while end_index < len(text) and text[end_index] != ' ' and text[end_index] != '\n' and text[end_index] != '\r':
-                    end_index += 1
-                placeholder = f"${{{placeholder_index}}}"
-                result = result.replace(char + text[i + 1:end_index], placeholder, 1)
-                placeholder_index += 1
-                placeholders_map[placeholder] =char + text[i + 1:end_index]
-                i = end_index - 1  # 更新索引
+        
+        def replace_placeholder(match):
+            placeholder = f"${{{len(placeholders_map) + 1}}}"
+            placeholders_map[placeholder] = match.group(0)
+            return placeholder
+        
+        # 单次扫描，依次替换控制字符、百分号占位符和 $ 变量（如 $entity.knowsWhoPlayerIs）
+        result = _PLACEHOLDER_RE.sub(replace_placeholder, text)
         self.logger.info(f"处理后的带占位符文本: {result}, {placeholders_map}")
         return (result, placeholders_map)
     
@@ -420,23 +745,31 @@ class ImprovedTranslator:
         """
         验证文本中的占位符，并将其解析为实际值
         """
+        found = set(_PLACEHOLDER_REF_RE.findall(text))
         for placeholder, original in placeholders_map.items():
-            if placeholder not in text:
+            if placeholder not in found:
                 raise ValueError(f"占位符缺失:{placeholder}, {original}, {text}") # 抛回给上层重试
-            text = text.replace(placeholder, original)
-        return text
+        # 单次扫描还原所有占位符，还原出的原文不会被再次替换
+        return _PLACEHOLDER_REF_RE.sub(lambda match: placeholders_map.get(match.group(0), match.group(0)), text)
     
     def translate_file(self, file_path: str, do_not_chage_state = False) -> List[TranslationObject]:
         """
         翻译单个文件
         """
         self._init_llm_api()
+        return asyncio.run(self._atranslate_file(file_path, do_not_chage_state))
+    
+    async def _atranslate_file(self, file_path: str, do_not_chage_state = False,
+                               aclient = None, semaphore: Optional[asyncio.Semaphore] = None) -> List[TranslationObject]:
+        """
+        translate_file 的异步版本，可与其他文件的翻译在同一事件循环中并发进行
+        """
         self.logger.info(f"开始翻译文件: {file_path}")
         self.progress_manager.set_translated_status(ProgressManager.STATUS_RUNNING, file_path)
         db = None
         try:
-            # 提取翻译对象
-            translate_objects = self.extract_translate_objects(file_path)
+            # 提取翻译对象（解析文件较慢，放到线程中执行，不阻塞其他文件的翻译）
+            translate_objects = await asyncio.to_thread(self.extract_translate_objects, file_path)
             file_progress = self.progress_manager.get_file_progress(file_path)
             if not file_progress:
                 raise ValueError(f"文件 {file_path} 未在进度管理器中找到")
@@ -470,26 +803,9 @@ class ImprovedTranslator:
                 start_index = file_progress.translated_count
             db = self.db_interface.get_sqlite_connection(self.config_name)
             with open(temp_file, 'a', encoding='utf-8') as f:
-                # 从指定位置开始翻译
-                for i in range(start_index, total_count):
-                    if self.progress_manager.is_interrupted():
-                        raise InterruptedError("翻译被中断")
-                    
-                    obj = translate_objects[i]
-                    
-                    self.logger.info(f"翻译进度: {i + 1}/{total_count}")
-                    
-                    # 翻译单个对象
-                    translated_obj = self.translate_text(obj, db)
-                    translate_objects[i] = translated_obj
-                    
-                    # 如果翻译成功，立即更新进度管理器
-                    self.progress_manager.increment_translation_progress(file_path)
-                    
-                    # 保存临时翻译结果
-                    f.write(json.dumps(translated_obj.to_dict(), ensure_ascii=False) + '\n')
-                    f.flush()
-                    
+                # 从指定位置开始并发翻译，结果按原顺序写入
+                await self._atranslate_objects(translate_objects, start_index, file_path, f, db, aclient, semaphore)
+                
                 self.logger.info(f"文件翻译完成: {file_path}")
             return translate_objects
         except InterruptedError as e:
@@ -503,8 +819,7 @@ class ImprovedTranslator:
         finally:
             if not do_not_chage_state:
                 self.progress_manager.set_translated_status(ProgressManager.STATUS_IDLE, file_path)
-            if db:
-                db.close()
+            self.progress_manager.flush()
             
     
     def apply_translations(self, file_path: str) -> bool:
@@ -523,13 +838,13 @@ class ImprovedTranslator:
             return False
         
         try:
-            translate_objects = []
-            with open(temp_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line.strip())
-                        obj = TranslationObject.from_dict(data)
-                        translate_objects.append(obj)
+            # 以二进制逐行读取，直接交给 orjson 解析，省去解码和 strip 产生的中间字符串
+            with open(temp_file, 'rb') as f:
+                translate_objects = [
+                    TranslationObject.from_dict(_json_loads(line))
+                    for line in f
+                    if not line.isspace()
+                ]
             
             return helper.apply_translate_objects(translate_objects, str(file_path))
             
@@ -548,21 +863,38 @@ class ImprovedTranslator:
         all_files_config.update(self.config.get("json_files", {}))
         all_files_config.update(self.config.get("jar_files", {}))
         
-        for file_path in all_files_config.keys():
-            try:
-                if self.progress_manager.is_interrupted():
-                    raise InterruptedError("翻译被中断")
-                self.translate_file(file_path, do_not_chage_state=True)
-            except InterruptedError as e:
-                self.logger.warning(f"翻译已中断: {e}")
-                break
-            except Exception as e:
-                self.logger.error(f"翻译文件失败 {file_path}: {e}")
-                continue
+        self._init_llm_api()
+        asyncio.run(self._atranslate_all(list(all_files_config.keys())))
         
         self.progress_manager.set_translated_status(ProgressManager.STATUS_IDLE, "")
         self.logger.info("所有文件翻译完成")
     
+    async def _atranslate_all(self, file_paths: List[str]):
+        """
+        同时翻译最多 file_concurrency 个文件，所有文件共享一个异步客户端和LLM请求并发上限
+        """
+        file_semaphore = asyncio.Semaphore(max(1, int(self.config.get("file_concurrency", 4))))
+        request_semaphore = self._create_request_semaphore()
+        aclient = self._create_async_client()
+        
+        async def translate_one_file(file_path: str):
+            async with file_semaphore:
+                if self.progress_manager.is_interrupted():
+                    return
+                try:
+                    await self._atranslate_file(file_path, True, aclient, request_semaphore)
+                except Exception as e:
+                    self.logger.error(f"翻译文件失败 {file_path}: {e}")
+        
+        try:
+            await asyncio.gather(*(translate_one_file(file_path) for file_path in file_paths))
+        finally:
+            if aclient:
+                await aclient.close()
+        
+        if self.progress_manager.is_interrupted():
+            self.logger.warning("翻译已中断: 翻译被中断")
+    
     def apply_all_translations(self):
         """
         应用所有翻译到原始文件
@@ -68,6 +68,20 @@ def download_model():
         print("3. 手动从 https://huggingface.co/sentence-transformers/all-MiniLM-L6-v2 下载")
         return False
 
+def _dir_size(path) -> int:
+    """统计目录下所有文件的总大小，使用 os.scandir 复用目录项中缓存的文件类型"""
+    total_size = 0
+    pending = [str(path)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    # 模型缓存中的文件可能是指向实际文件的符号链接，按目标文件计算大小
+                    total_size += entry.stat().st_size
+    return total_size
+
 def check_model():
     """检查本地模型状态"""
     model_paths = [
@@ -88,7 +102,7 @@ def check_model():
                     print(f"✓ 发现完整模型: {path}")
                     
                     # 获取模型大小
-                    total_size = sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+                    total_size = _dir_size(path)
                     size_mb = total_size / (1024 * 1024)
                     print(f"  模型大小: {size_mb:.1f} MB")
                     
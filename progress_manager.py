@@ -20,16 +20,66 @@ along with ss_translator.  If not, see <https://www.gnu.org/licenses/>.
 翻译进度管理器
 负责跟踪和管理每个文件的翻译进度
 """
+import hashlib
 import json
 import logging
+import os
+import queue
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional
+from dataclasses import dataclass, fields
 
 from translate_helper.translate_helper_base import TranslateHelper
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+# 优先使用 orjson 解析，两者都可以直接接受 bytes
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# 进度增量日志超过该字节数时合并回进度快照文件
+_LOG_COMPACT_SIZE = 256 * 1024
+
+# 同步进度时并行统计临时翻译文件的最大线程数
+_SYNC_WORKERS = 32
+
+# 统计临时翻译文件行数时每次读取的字节数
+_COUNT_CHUNK_SIZE = 1 << 20
+
+# 重置全部进度时并行删除文件的最大线程数
+_RESET_WORKERS = 8
+
+# 通知后台保存线程退出的标记
+_SAVE_STOP = object()
+
+
+def _progress_save_worker(manager_ref: 'weakref.ref[ProgressManager]', save_queue: queue.Queue):
+    """后台保存线程：每收到一次请求就把增量日志合并进快照，只持有进度管理器的弱引用"""
+    while save_queue.get() is not _SAVE_STOP:
+        manager = manager_ref()
+        if manager is None:
+            return
+        manager.flush(wait=True)
+        del manager
+
+
+def _stop_progress_save_worker(save_queue: queue.Queue):
+    """进度管理器被回收时唤醒并结束后台保存线程"""
+    try:
+        save_queue.put_nowait(_SAVE_STOP)
+    except queue.Full:
+        # 还有未处理的请求，线程处理时会发现进度管理器已被回收并退出
+        pass
+
+
+@dataclass(slots=True)
 class FileProgress:
     """单个文件的进度信息"""
     file_path: str
@@ -40,6 +90,8 @@ class FileProgress:
     description: str = ""
     translating: bool = False  # 是否正在翻译中
     no_contents: bool = False  # 是否没有内容需要翻译
+    temp_mtime: float = 0.0  # 上次统计时临时翻译文件的修改时间
+    temp_size: int = 0  # 上次统计时临时翻译文件的大小
     
     @property
     def progress_percentage(self) -> float:
@@ -61,18 +113,34 @@ class FileProgress:
             return "待翻译"
         
         
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典；字段都是基本类型，直接构建，不需要 asdict 的深拷贝"""
+        return {
+            'file_path': self.file_path,
+            'file_type': self.file_type,
+            'total_count': self.total_count,
+            'translated_count': self.translated_count,
+            'completed': self.completed,
+            'description': self.description,
+            'translating': self.translating,
+            'no_contents': self.no_contents,
+            'temp_mtime': self.temp_mtime,
+            'temp_size': self.temp_size,
+        }
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FileProgress':
-        """从字典创建FileProgress实例"""
-        return cls(
-            file_path=data.get('file_path', ''),
-            file_type=data.get('file_type', ''),
-            total_count=data.get('total_count', 0),
-            translated_count=data.get('translated_count', 0),
-            completed=data.get('completed', False),
-            description=data.get('description', ''),
-            no_contents=data.get('no_contents', False),
-        )
+        """从字典创建FileProgress实例，忽略未知字段，缺少的字段使用默认值"""
+        kwargs = _FROM_DICT_DEFAULTS.copy()
+        kwargs.update({k: data[k] for k in _FROM_DICT_FIELDS.intersection(data)})
+        return cls(**kwargs)
+
+
+# from_dict 接受的字段，translating 是运行时状态，不从文件恢复
+_FROM_DICT_FIELDS = frozenset(f.name for f in fields(FileProgress)) - {'translating'}
+
+# 没有类默认值的字段在记录缺失时使用的默认值
+_FROM_DICT_DEFAULTS = {'file_path': '', 'file_type': '', 'total_count': 0, 'translated_count': 0}
 
 
 class ProgressManager:
@@ -102,8 +170,29 @@ class ProgressManager:
         # 文件进度缓存
         self._file_progress_cache: Dict[str, FileProgress] = {}
         
-        # 进度文件路径
+        # 文件类型和路径计算用的helper缓存，配置在进度管理器生命周期内不变
+        self._file_type_cache: Dict[str, str] = {}
+        self._helper_cache: Dict[str, Optional[TranslateHelper]] = {}
+        # 文件路径到helper的直接映射，路径计算时只需一次字典查找
+        self._file_helper_cache: Dict[str, Optional[TranslateHelper]] = {}
+        
+        # 进度快照文件路径
         self.progress_file = self.mod_work_dir / "translation_progress.json"
+        # 进度增量日志路径，每次修改只追加一行，避免每次修改都重写整个快照文件
+        self.progress_log = self.mod_work_dir / "translation_progress.log"
+        
+        # 增量日志中有尚未合并到快照的记录时置位，由 flush() 合并写入
+        self._dirty = False
+        self._save_lock = threading.Lock()
+        self._log_size = 0
+        # 上次读取或写入的进度文件内容摘要
+        self._last_saved_digest: Optional[bytes] = None
+        
+        # 快照写入交给后台线程，队列只保留一个待处理请求，写入时总是使用最新的进度
+        self._save_queue: queue.Queue = queue.Queue(maxsize=1)
+        threading.Thread(target=_progress_save_worker, args=(weakref.ref(self), self._save_queue),
+                         name="progress-saver", daemon=True).start()
+        weakref.finalize(self, _stop_progress_save_worker, self._save_queue)
         
         # 初始化进度信息
         self._initialize_progress()
@@ -138,6 +227,7 @@ class ProgressManager:
         return self.status == self.STATUS_INTERUPTED
         
     def refresh_files_status(self):
+        """重新全量统计文件数和完成数；计数平时由各修改方法增量维护，只在需要校正时调用"""
         self.total_files = 0
         self.completed_files = 0
         for progress in self._file_progress_cache.values():
@@ -155,54 +245,84 @@ class ProgressManager:
         all_files_config.update(self.config.get("json_files", {}))
         all_files_config.update(self.config.get("jar_files", {}))
         
-        # 载入文件记录
+        # 载入文件记录，先放在临时字典中，逐个取出后剩下的就是已不在配置中的文件
+        saved: Dict[str, FileProgress] = {}
+        try:
+            # 只读取一次文件字节，空文件视为没有记录
+            raw = self.progress_file.read_bytes()
+            j_data = _json_loads(raw) if raw.strip() else {}
+            self._last_saved_digest = hashlib.blake2b(raw, digest_size=16).digest()
+            saved = {path: FileProgress.from_dict(data) for path, data in j_data.items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.error(f"加载进度文件失败: {e}")
         
-        if self.progress_file.exists():
-            try:
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    j_data = json.load(f)
-                    for path, data in j_data.items():
-                        file_type = TranslateHelper.get_file_type(path, self.config)
-                        if file_type == "unknown":
-                            self.logger.warning(f"跳过未知文件类型(可能是后来删除的文件): {path}")
-                            continue
-                        self._file_progress_cache[path] = FileProgress.from_dict(data)
-            except Exception as e:
-                self.logger.error(f"加载进度文件失败: {e}")
+        # 在快照基础上重放增量日志
+        self._replay_progress_log(saved)
         
         for file_path, file_config in all_files_config.items():
-            # 确定文件类型
-            file_type = TranslateHelper.get_file_type(file_path, self.config)
-            
-            # 获取文件描述
-            description = self._get_file_description(file_path, file_type, file_config)
-            
-            total_count = 0
-            
-            if file_path in self._file_progress_cache:
-                total_count = self._file_progress_cache[file_path].total_count
+            file_type = self._file_type(file_path)
+            saved_progress = saved.pop(file_path, None)
             
-            # 计算已翻译数量
-            translated_count = self._count_translated_objects(file_path)
-            
-            # 判断是否完成
-            completed = total_count > 0 and translated_count >= total_count
-            
-            # 创建进度对象
+            # 先沿用已记录的数量和临时文件状态，临时文件未变化时统计会直接返回记录的数量
             progress = FileProgress(
                 file_path=file_path,
                 file_type=file_type,
-                total_count=total_count,
-                translated_count=translated_count,
-                completed=completed,
-                description=description
+                total_count=saved_progress.total_count if saved_progress else 0,
+                translated_count=saved_progress.translated_count if saved_progress else 0,
+                description=self._get_file_description(file_path, file_type, file_config),
+                temp_mtime=saved_progress.temp_mtime if saved_progress else 0.0,
+                temp_size=saved_progress.temp_size if saved_progress else 0
             )
-            
             self._file_progress_cache[file_path] = progress
             
-            self.logger.debug(f"初始化文件进度: {file_path} - {translated_count}/{total_count}")
+            progress.translated_count = self._count_translated_objects(file_path)
+            progress.completed = progress.total_count > 0 and progress.translated_count >= progress.total_count
+            
+            self.logger.debug("初始化文件进度: %s - %d/%d", file_path, progress.translated_count, progress.total_count)
             self.total_files += 1
-            self.completed_files += (1 if completed else 0)
+            self.completed_files += (1 if progress.completed else 0)
+        
+        for path in saved:
+            self.logger.warning(f"跳过未知文件类型(可能是后来删除的文件): {path}")
+        
+        # 上次退出前未合并的增量日志，初始化后合并回快照
+        if self._dirty:
+            self.flush(wait=True)
+    
+    def _replay_progress_log(self, saved: Dict[str, FileProgress]):
+        """读取进度增量日志，把其中的记录应用到从快照加载的进度上"""
+        try:
+            raw = self.progress_log.read_bytes()
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self.logger.error(f"读取进度日志失败: {e}")
+            return
+        
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = _json_loads(line)
+            except Exception:
+                # 最后一行可能在写入中途被中断，忽略无法解析的记录
+                self.logger.warning(f"跳过无法解析的进度日志记录: {line[:100]!r}")
+                continue
+            path = record.get("p")
+            if not path:
+                continue
+            # 快照中还没有的文件（例如新加入配置后尚未合并快照）也要保留日志中的记录
+            progress = saved.get(path)
+            if progress is None:
+                progress = saved[path] = FileProgress(file_path=path, file_type="", total_count=0, translated_count=0)
+            progress.total_count = record.get("t", progress.total_count)
+            progress.translated_count = record.get("n", progress.translated_count)
+            progress.completed = record.get("c", progress.completed)
+        
+        self._log_size = len(raw)
+        self._dirty = bool(raw.strip())
     
     
     def _get_file_description(self, file_path: str, file_type: str, file_config: Any) -> str:
@@ -227,57 +347,99 @@ class ProgressManager:
             # 构建临时翻译文件路径
             temp_file = self.get_temp_file_path(file_path)
             
-            if not temp_file.exists():
+            try:
+                stat = temp_file.stat()
+            except FileNotFoundError:
                 return 0
             
-            # 读取临时翻译文件计算已翻译数量
+            # 临时文件的修改时间和大小与上次统计时一致，直接使用记录的数量
+            progress = self._file_progress_cache.get(file_path)
+            if progress is not None and progress.temp_mtime == stat.st_mtime and progress.temp_size == stat.st_size:
+                return progress.translated_count
+            
+            # 临时翻译文件每行一个翻译对象，按块读取字节并统计换行符数量
+            # 不经过缓冲层，直接读入复用的缓冲区，整个统计过程只占用一个块的内存
             translated_count = 0
-            with open(temp_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            # data = json.loads(line.strip())
-                            # 检查是否已翻译
-                            # if data.get('is_translated', False) and data.get('translation', '').strip():
-                            translated_count += 1
-                        except json.JSONDecodeError:
-                            continue
+            last_byte = b''
+            buf = bytearray(_COUNT_CHUNK_SIZE)
+            with open(temp_file, 'rb', buffering=0) as f:
+                while n := f.readinto(buf):
+                    chunk = buf if n == len(buf) else buf[:n]
+                    translated_count += chunk.count(b'\n')
+                    last_byte = buf[n - 1:n]
+            # 最后一行没有换行符（例如写入中途被中断）时也计为一条
+            if last_byte and last_byte != b'\n':
+                translated_count += 1
             
+            if progress is not None:
+                progress.temp_mtime = stat.st_mtime
+                progress.temp_size = stat.st_size
             return translated_count
             
         except Exception as e:
             self.logger.warning(f"计算已翻译对象数失败 {file_path}: {e}")
             return 0
     
+    def _file_type(self, file_path: str) -> str:
+        """获取文件类型，按文件路径缓存"""
+        file_type = self._file_type_cache.get(file_path)
+        if file_type is None:
+            file_type = TranslateHelper.get_file_type(file_path, self.config)
+            self._file_type_cache[file_path] = file_type
+        return file_type
+    
+    def _path_helper(self, file_type: str) -> Optional[TranslateHelper]:
+        """获取用于计算文件路径的helper，按文件类型缓存，避免每次都创建helper"""
+        if file_type not in self._helper_cache:
+            self._helper_cache[file_type] = TranslateHelper.get_helper_by_file_type(file_type, self.logger, self.config)
+        return self._helper_cache[file_type]
+    
+    def _file_helper(self, file_path: str) -> Optional[TranslateHelper]:
+        """获取文件路径对应的helper，按文件路径缓存"""
+        try:
+            return self._file_helper_cache[file_path]
+        except KeyError:
+            file_type = self._file_type(file_path)
+            helper = self._path_helper(file_type)
+            if not helper:
+                self.logger.error(f"未找到支持的翻译助手: {file_type}")
+            self._file_helper_cache[file_path] = helper
+            return helper
+    
     def get_temp_file_path(self, file_path: str) -> Path:
         """获取临时翻译文件路径"""
-        file_type = TranslateHelper.get_file_type(file_path, self.config)
-        helper = TranslateHelper.get_helper_by_file_type(file_type, self.logger, self.config)
-        if not helper:
-            self.logger.error(f"未找到支持的翻译助手: {file_type}")
-            return Path("")
-        return helper.get_translated_temp_file_path(file_path)
+        helper = self._file_helper(file_path)
+        return helper.get_translated_temp_file_path(file_path) if helper else Path("")
     
     def get_org_file_path(self, file_path: str) -> Path:
-        file_type = TranslateHelper.get_file_type(file_path, self.config)
-        helper = TranslateHelper.get_helper_by_file_type(file_type, self.logger, self.config)
-        if not helper:
-            self.logger.error(f"未找到支持的翻译助手: {file_type}")
-            return Path("")
-        return helper.get_original_file_path(file_path)
+        helper = self._file_helper(file_path)
+        return helper.get_original_file_path(file_path) if helper else Path("")
     
     def sync_progress_from_temp_files(self):
         """
         从临时翻译文件同步进度信息
         比refresh_progress轻量，只读取临时文件的翻译数量
         """
-        for file_path in self._file_progress_cache.keys():
+        file_paths = list(self._file_progress_cache.keys())
+        if not file_paths:
+            return
+        
+        # 统计临时文件行数是IO密集操作，多线程并行读取，结果在当前线程写回
+        with ThreadPoolExecutor(max_workers=min(_SYNC_WORKERS, len(file_paths))) as executor:
+            counts = list(executor.map(self._count_translated_objects, file_paths))
+        
+        for file_path, translated_count in zip(file_paths, counts):
             progress = self._file_progress_cache[file_path]
-            translated_count = self._count_translated_objects(file_path)
             progress.translated_count = translated_count
-            progress.completed = progress.total_count > 0 and translated_count >= progress.total_count
+            self._set_completed(progress, progress.total_count > 0 and translated_count >= progress.total_count)
             
-            self.logger.debug(f"同步文件进度: {file_path} - {translated_count}/{progress.total_count}")
+            self.logger.debug("同步文件进度: %s - %d/%d", file_path, translated_count, progress.total_count)
+    
+    def _set_completed(self, progress: FileProgress, completed: bool):
+        """设置文件完成状态，并同步增量维护已完成文件数"""
+        if completed != progress.completed:
+            self.completed_files += (1 if completed else -1)
+            progress.completed = completed
     
     def update_translation_progress(self, file_path: str, translated_count: int):
         """
@@ -290,9 +452,13 @@ class ProgressManager:
         if file_path in self._file_progress_cache:
             progress = self._file_progress_cache[file_path]
             progress.translated_count = translated_count
-            progress.completed = progress.total_count > 0 and translated_count >= progress.total_count
+            self._set_completed(progress, progress.total_count > 0 and translated_count >= progress.total_count)
+            # 数量不再对应上次统计的临时文件，下次需要重新统计
+            progress.temp_mtime = 0.0
+            progress.temp_size = 0
             
-            self.logger.debug(f"更新翻译进度: {file_path} - {translated_count}/{progress.total_count}")
+            self.logger.debug("更新翻译进度: %s - %d/%d", file_path, translated_count, progress.total_count)
+            self._append_progress_log(progress)
     
     def increment_translation_progress(self, file_path: str, increment: int = 1):
         """
@@ -305,9 +471,10 @@ class ProgressManager:
         if file_path in self._file_progress_cache:
             progress = self._file_progress_cache[file_path]
             progress.translated_count += increment
-            progress.completed = progress.total_count > 0 and progress.translated_count >= progress.total_count
+            self._set_completed(progress, progress.total_count > 0 and progress.translated_count >= progress.total_count)
             
-            self.logger.debug(f"增量更新翻译进度: {file_path} - {progress.translated_count}/{progress.total_count}")
+            # 每写入一批翻译都会调用，使用延迟格式化，未开启DEBUG时不生成日志字符串
+            self.logger.debug("增量更新翻译进度: %s - %d/%d", file_path, progress.translated_count, progress.total_count)
     
     def set_file_total_count(self, file_path: str, total_count: int):
         """
@@ -320,32 +487,106 @@ class ProgressManager:
         if file_path in self._file_progress_cache:
             progress = self._file_progress_cache[file_path]
             progress.total_count = total_count
-            progress.completed = total_count > 0 and progress.translated_count >= total_count
+            self._set_completed(progress, total_count > 0 and progress.translated_count >= total_count)
             
-            self.logger.debug(f"设置文件总数量: {file_path} - {progress.translated_count}/{total_count}")
-            self.save_progress()
+            self.logger.debug("设置文件总数量: %s - %d/%d", file_path, progress.translated_count, total_count)
+            self._append_progress_log(progress)
+    
+    def _append_progress_log(self, progress: FileProgress):
+        """把单个文件的进度追加到增量日志，日志过大时合并回快照"""
+        if orjson is not None:
+            line = orjson.dumps({"p": progress.file_path, "t": progress.total_count,
+                                 "n": progress.translated_count, "c": progress.completed}) + b"\n"
+        else:
+            line = json.dumps({"p": progress.file_path, "t": progress.total_count,
+                               "n": progress.translated_count, "c": progress.completed},
+                              ensure_ascii=False).encode('utf-8') + b"\n"
+        
+        with self._save_lock:
+            try:
+                # 一次 write 调用追加整行
+                with open(self.progress_log, 'ab') as f:
+                    f.write(line)
+                self._log_size += len(line)
+                self._dirty = True
+            except Exception as e:
+                self.logger.error(f"写入进度日志失败: {e}")
+                return
+            need_compact = self._log_size > _LOG_COMPACT_SIZE
+        
+        if need_compact:
+            self.flush()
+    
+    def flush(self, wait: bool = False):
+        """
+        如果增量日志中有未合并的记录，合并写入进度快照文件
+        
+        Args:
+            wait: 为True时在当前线程立即写入，否则交给后台线程，调用方不等待磁盘IO
+        """
+        if not wait:
+            try:
+                self._save_queue.put_nowait(None)
+            except queue.Full:
+                # 已有待处理的请求，后台线程写入时会使用最新的进度
+                pass
+            return
+        
+        with self._save_lock:
+            if not self._dirty:
+                return
+            self._compact()
+    
+    def _compact(self):
+        """重写进度快照并清空增量日志，调用方需持有 _save_lock"""
+        if not self.save_progress():
+            # 快照写入失败时保留日志，下次启动仍可重放
+            return
+        try:
+            self.progress_log.unlink(missing_ok=True)
+        except Exception as e:
+            self.logger.error(f"清空进度日志失败: {e}")
+            return
+        self._log_size = 0
+        self._dirty = False
             
-    def save_progress(self):
-        """保存当前进度到文件"""
+    def save_progress(self) -> bool:
+        """保存当前进度到快照文件，成功（或内容无变化）时返回True"""
         try:
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump({path: asdict(progress) for path, progress in self._file_progress_cache.items()}, f, ensure_ascii=False, indent=4)
+            # 优先使用 orjson，直接序列化 dataclass 并生成 UTF-8 字节
+            if orjson is not None:
+                data = orjson.dumps(self._file_progress_cache, option=orjson.OPT_INDENT_2)
+            else:
+                payload = {path: progress.to_dict() for path, progress in self._file_progress_cache.items()}
+                data = json.dumps(payload, ensure_ascii=False, indent=4).encode('utf-8')
+            
+            # 内容与上次读取或写入的完全相同时不再写文件
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest == self._last_saved_digest:
+                return True
+            # 先写临时文件再原子替换，写入中途中断也不会损坏原有快照
+            tmp_file = self.progress_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, self.progress_file)
+            self._last_saved_digest = digest
             self.logger.info(f"已保存进度到文件: {self.progress_file}")
+            return True
         except Exception as e:
             self.logger.error(f"保存进度文件失败: {e}")
+            return False
     
     def get_file_progress(self, file_path: str) -> Optional[FileProgress]:
         """获取单个文件的进度"""
         return self._file_progress_cache.get(file_path)
     
-    def get_all_progress(self) -> Dict[str, FileProgress]:
-        """获取所有文件的进度"""
-        return self._file_progress_cache.copy()
+    def get_all_progress(self) -> Mapping[str, FileProgress]:
+        """获取所有文件的进度；返回缓存的只读视图，不复制字典，初始化后文件集合不再变化，可以直接遍历"""
+        return MappingProxyType(self._file_progress_cache)
     
     def get_overall_progress(self) -> Dict[str, Any]:
-        """获取总体进度统计"""
-        total_files = len(self._file_progress_cache)
-        completed_files = sum(1 for p in self._file_progress_cache.values() if p.completed)
+        """获取总体进度统计，直接使用增量维护的计数"""
+        total_files = self.total_files
+        completed_files = self.completed_files
         
         return {
             "total_files": total_files,
@@ -365,7 +606,9 @@ class ProgressManager:
             if file_path in self._file_progress_cache:
                 progress = self._file_progress_cache[file_path]
                 progress.translated_count = 0
-                progress.completed = False
+                self._set_completed(progress, False)
+                progress.temp_mtime = 0.0
+                progress.temp_size = 0
                 
                 # 删除临时翻译文件
                 temp_file = self.get_temp_file_path(file_path)
@@ -385,6 +628,32 @@ class ProgressManager:
                 
                 self.logger.info(f"重置文件进度: {file_path}")
         else:
-            # 重置所有文件
-            for fp in list(self._file_progress_cache.keys()):
-                self.reset_progress(fp)
\ No newline at end of file
+            # 重置所有文件：先在内存中一次清零，再并行删除所有临时翻译文件和源文件
+            paths: List[Path] = []
+            for fp, progress in self._file_progress_cache.items():
+                progress.translated_count = 0
+                progress.completed = False
+                progress.temp_mtime = 0.0
+                progress.temp_size = 0
+                paths.append(self.get_temp_file_path(fp))
+                paths.append(self.get_org_file_path(fp))
+            self.completed_files = 0
+            
+            # 找不到helper时路径为空，不能删除
+            paths = [p for p in paths if p != Path("")]
+            deleted = 0
+            if paths:
+                with ThreadPoolExecutor(max_workers=min(_RESET_WORKERS, len(paths))) as executor:
+                    deleted = sum(executor.map(self._unlink_file, paths))
+            self.logger.info(f"重置所有文件进度，共删除 {deleted} 个文件")
+    
+    def _unlink_file(self, path: Path) -> bool:
+        """删除文件，文件不存在时直接返回False"""
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.logger.error(f"删除文件失败 {path}: {e}")
+            return False
\ No newline at end of file
@@ -23,14 +23,170 @@ along with ss_translator.  If not, see <https://www.gnu.org/licenses/>.
 import sqlite3
 import os
 import json
+import queue
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 import logging
 from translation_object import TranslationObject
 
 logger = logging.getLogger(__name__)
 
+# 批量写入时每个事务包含的最大行数
+_BATCH_CHUNK_SIZE = 1000
+# 批量查询/删除时每条 IN 语句包含的最大键数（低于 SQLite 默认参数上限 999）
+_IN_CHUNK_SIZE = 500
+# 每个连接缓存的预编译语句数量（sqlite3 默认 128）
+_CACHED_STATEMENTS = 512
+# 每个翻译数据库最多保留的只读连接数量
+_READ_POOL_SIZE = os.cpu_count() or 4
+
+# 高频 SQL 语句，作为模块常量复用，命中连接的语句缓存
+# 按 TranslationObject 字段顺序排列的列，查询结果可以直接按位置构造对象
+_TRANSLATION_OBJECT_COLUMNS = ("file_name, original_text, process_text, translation, context, dangerous, "
+                               "is_translated, is_suggested_to_translate, llm_reason, translation_key, "
+                               "approved, approved_text")
+_SQL_SELECT_TRANSLATION_BY_KEY = f"SELECT {_TRANSLATION_OBJECT_COLUMNS} FROM translations WHERE translation_key = ?"
+_SQL_SELECT_TRANSLATION_BY_ORIGINAL = f"SELECT {_TRANSLATION_OBJECT_COLUMNS} FROM translations WHERE original_text = ? LIMIT 1"
+# 已有记录时原地更新，保留 created_at；不像 INSERT OR REPLACE 那样先删除再插入整行
+_SQL_UPSERT_TRANSLATION = '''
+    INSERT INTO translations 
+    (translation_key, file_name, original_text, process_text, translation, context,
+     dangerous, is_translated, is_suggested_to_translate, llm_reason, approved, 
+     approved_text, config_name, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(translation_key) DO UPDATE SET
+        file_name = excluded.file_name,
+        original_text = excluded.original_text,
+        process_text = excluded.process_text,
+        translation = excluded.translation,
+        context = excluded.context,
+        dangerous = excluded.dangerous,
+        is_translated = excluded.is_translated,
+        is_suggested_to_translate = excluded.is_suggested_to_translate,
+        llm_reason = excluded.llm_reason,
+        approved = excluded.approved,
+        approved_text = excluded.approved_text,
+        config_name = excluded.config_name,
+        updated_at = excluded.updated_at
+'''
+
+
+# 已有专有名词时原地更新；INSERT OR REPLACE 的隐式删除不会触发全文索引的删除触发器
+_SQL_UPSERT_TERMINOLOGY = '''
+    INSERT INTO terminology
+    (term, translation, domain, notes, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(term) DO UPDATE SET
+        translation = excluded.translation,
+        domain = excluded.domain,
+        notes = excluded.notes,
+        updated_at = excluded.updated_at
+'''
+
+# 模糊搜索时可以走全文索引的字段
+_TRANSLATION_FTS_COLUMNS = ('file_name', 'original_text', 'translation', 'approved_text', 'context')
+# trigram 分词至少需要3个字符才能命中全文索引，更短的搜索词仍使用 LIKE
+_FTS_MIN_CHARS = 3
+
+
+def _create_fts_index(cursor: sqlite3.Cursor, table: str, columns: Tuple[str, ...]) -> bool:
+    """
+    为表创建 trigram 分词的 FTS5 外部内容索引及同步触发器，新建索引时从原表重建
+    
+    Returns:
+        FTS5 可用时返回True，SQLite 不支持时返回False
+    """
+    fts_table = f"{table}_fts"
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f"new.{c}" for c in columns)
+    old_values = ', '.join(f"old.{c}" for c in columns)
+    try:
+        existed = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+        ).fetchone() is not None
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                {column_list}, content='{table}', content_rowid='rowid', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        logger.warning(f"SQLite 不支持 FTS5 trigram，{table} 的模糊搜索使用 LIKE: {e}")
+        return False
+    
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+            INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+        END
+    ''')
+    if not existed:
+        # 已有数据的数据库第一次建立索引时从原表重建
+        cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    return True
+
+
+def _fts_searchable(text: str) -> bool:
+    """搜索词是否可以用全文索引代替 LIKE '%...%'（过短或包含 LIKE 通配符时不行）"""
+    return len(text) >= _FTS_MIN_CHARS and '%' not in text and '_' not in text
+
+
+def _fts_phrase(columns: str, text: str) -> str:
+    """构造只在指定列中做子串匹配的 FTS5 查询"""
+    return f'{columns} : "{text.replace(chr(34), chr(34) * 2)}"'
+
+
+def _configure_connection(conn: sqlite3.Connection, db_path: str):
+    """为数据库连接设置并发与缓存相关的PRAGMA"""
+    if db_path != ':memory:':
+        # 内存数据库不支持WAL和mmap
+        conn.execute('PRAGMA journal_mode=WAL')  # 写前日志模式，支持并发读写
+        conn.execute('PRAGMA mmap_size=268435456')  # 256MB 内存映射读取
+        conn.execute('PRAGMA wal_autocheckpoint=1000')  # 每1000页自动检查点，防止WAL无限增长
+    conn.execute('PRAGMA synchronous=NORMAL')  # 平衡性能和安全
+    conn.execute('PRAGMA cache_size=-65536')  # 64MB 页缓存
+    conn.execute('PRAGMA temp_store=memory')  # 临时存储在内存中
+    conn.execute('PRAGMA busy_timeout=5000')  # 数据库被锁时最多等待5秒
+
+
+def _translation_row(obj: TranslationObject, translation_key: str, config_name: str, current_time: str) -> tuple:
+    """构造写入 translations 表的参数元组，直接读取属性，避免 to_dict 的深拷贝开销"""
+    return (
+        translation_key,
+        obj.file_name,
+        obj.original_text,
+        obj.process_text,
+        obj.translation,
+        obj.context,
+        obj.dangerous,
+        obj.is_translated,
+        obj.is_suggested_to_translate,
+        obj.llm_reason,
+        obj.approved,
+        obj.approved_text,
+        config_name,
+        current_time,  # 如果是新记录，创建时间
+        current_time   # 更新时间
+    )
+
+
+def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """创建返回普通元组的游标，热点查询按位置取值，不为每行创建 sqlite3.Row"""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
 
 class SQLiteTranslationMemory:
     """基于 SQLite 的翻译记忆库"""
@@ -39,8 +195,22 @@ class SQLiteTranslationMemory:
         self.workspace_dir = Path(workspace_dir)
         self.workspace_dir.mkdir(exist_ok=True)
         
-        # 数据库连接字典（按配置名称区分）
-        self.db_connections = {}
+        # 数据库连接字典（按配置名称区分），每个配置复用同一个长连接
+        self.db_connections: Dict[str, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        
+        # 每个连接的写锁，同一连接上的事务不能在多个线程间交错
+        self._write_locks: Dict[str, threading.RLock] = {}
+        
+        # 只读连接池（按配置名称区分），读操作不和写连接争用
+        self.db_connections_read: Dict[str, queue.Queue] = {}
+        
+        # 已建好表和索引的翻译数据库，避免每次取连接都重复执行建表语句
+        self._initialized_configs = set()
+        
+        # 建立了全文索引的翻译数据库和专有名词数据库
+        self._fts_configs = set()
+        self._terminology_fts = False
         
         # 专有名词数据库（全局共享）
         self.terminology_db_path = self.workspace_dir / "terminology.db"
@@ -49,14 +219,12 @@ class SQLiteTranslationMemory:
     def _init_terminology_db(self):
         """初始化专有名词数据库"""
         try:
-            conn = sqlite3.connect(str(self.terminology_db_path), timeout=5.0)
+            db_path = str(self.terminology_db_path)
+            conn = sqlite3.connect(db_path, timeout=5.0)
             conn.row_factory = sqlite3.Row  # 使结果可以按列名访问
             
             # 配置并发访问模式
-            conn.execute('PRAGMA journal_mode=WAL')
-            conn.execute('PRAGMA synchronous=NORMAL')
-            conn.execute('PRAGMA cache_size=10000')
-            conn.execute('PRAGMA temp_store=memory')
+            _configure_connection(conn, db_path)
             
             cursor = conn.cursor()
             cursor.execute('''
@@ -74,6 +242,9 @@ class SQLiteTranslationMemory:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_terminology_domain ON terminology(domain)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_terminology_translation ON terminology(translation)')
             
+            # 专有名词和译文的模糊搜索使用全文索引
+            self._terminology_fts = _create_fts_index(cursor, 'terminology', ('term', 'translation'))
+            
             conn.commit()
             conn.close()
         except Exception as e:
@@ -86,15 +257,12 @@ class SQLiteTranslationMemory:
     def _init_translation_db(self, config_name: str):
         """初始化翻译历史数据库"""
         try:
-            db_path = self.get_translation_db_path(config_name)
-            conn = sqlite3.connect(str(db_path), timeout=5.0)
+            db_path = str(self.get_translation_db_path(config_name))
+            conn = sqlite3.connect(db_path, timeout=5.0)
             conn.row_factory = sqlite3.Row
             
             # 配置并发访问模式
-            conn.execute('PRAGMA journal_mode=WAL')
-            conn.execute('PRAGMA synchronous=NORMAL')
-            conn.execute('PRAGMA cache_size=10000')
-            conn.execute('PRAGMA temp_store=memory')
+            _configure_connection(conn, db_path)
             
             cursor = conn.cursor()
             cursor.execute('''
@@ -120,42 +288,167 @@ class SQLiteTranslationMemory:
             # 创建索引以提高查询性能
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_translations_file_name ON translations(file_name)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_translations_original_text ON translations(original_text)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_translations_translation ON translations(translation)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_translations_approved ON translations(approved)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_translations_created_at ON translations(created_at)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_translations_updated_at ON translations(updated_at)')
             
+            # 译文只做 LIKE '%...%' 模糊匹配，创建时间没有查询使用，这两个索引只会拖慢写入
+            cursor.execute('DROP INDEX IF EXISTS idx_translations_translation')
+            cursor.execute('DROP INDEX IF EXISTS idx_translations_created_at')
+            
+            # 文本字段的模糊搜索使用全文索引
+            if _create_fts_index(cursor, 'translations', _TRANSLATION_FTS_COLUMNS):
+                self._fts_configs.add(config_name)
+            
             conn.commit()
             conn.close()
+            self._initialized_configs.add(config_name)
         except Exception as e:
             logger.error(f"初始化翻译数据库失败 {config_name}: {e}")
     
     def get_translation_connection(self, config_name: str) -> sqlite3.Connection:
-        """获取特定配置的数据库连接 - 每次创建新连接避免锁问题"""
-        # 确保数据库存在
-        self._init_translation_db(config_name)
+        """获取特定配置的数据库连接，每个配置只创建一次并长期复用，由 close_all_connections 统一关闭"""
+        conn = self.db_connections.get(config_name)
+        if conn is not None:
+            return conn
+        
+        with self._connections_lock:
+            conn = self.db_connections.get(config_name)
+            if conn is not None:
+                return conn
+            
+            db_path = str(self.get_translation_db_path(config_name))
+            
+            # 确保数据库存在（每个配置只建一次表）
+            if config_name not in self._initialized_configs:
+                self._init_translation_db(config_name)
+            
+            # 自动提交模式：单条写入各自立即提交，批量写入显式使用 BEGIN IMMEDIATE 事务，
+            # 避免隐式的延迟事务在升级为写锁时遇到 SQLITE_BUSY
+            conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0,
+                                   cached_statements=_CACHED_STATEMENTS, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            
+            # 配置并发访问模式，PRAGMA 只在创建连接时执行一次
+            _configure_connection(conn, db_path)
+            
+            self._write_locks[config_name] = threading.RLock()
+            self.db_connections[config_name] = conn
+            return conn
+    
+    def _get_write_lock(self, config_name: str) -> threading.RLock:
+        """获取特定配置连接的写锁，写操作和事务需要在锁内执行"""
+        lock = self._write_locks.get(config_name)
+        if lock is None:
+            self.get_translation_connection(config_name)
+            lock = self._write_locks[config_name]
+        return lock
+    
+    def _acquire_read_connection(self, config_name: str) -> sqlite3.Connection:
+        """从只读连接池取出一个连接，池中没有空闲连接时新建"""
+        pool = self.db_connections_read.get(config_name)
+        if pool is not None:
+            try:
+                return pool.get_nowait()
+            except queue.Empty:
+                pass
         
-        # 每次创建新连接，避免连接池导致的锁问题
+        # 先通过写连接确保数据库和表已经创建
+        self.get_translation_connection(config_name)
         db_path = self.get_translation_db_path(config_name)
-        conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=5.0)
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False,
+                               timeout=5.0, cached_statements=_CACHED_STATEMENTS, isolation_level=None)
         conn.row_factory = sqlite3.Row
-        
-        # 配置并发访问模式
-        conn.execute('PRAGMA journal_mode=WAL')  # 写前日志模式，支持并发读写
-        conn.execute('PRAGMA synchronous=NORMAL')  # 平衡性能和安全
-        conn.execute('PRAGMA cache_size=10000')  # 增加缓存
-        conn.execute('PRAGMA temp_store=memory')  # 临时存储在内存中
-        
+        conn.execute('PRAGMA query_only=1')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-65536')
+        conn.execute('PRAGMA busy_timeout=5000')
         return conn
     
+    def _release_read_connection(self, config_name: str, conn: sqlite3.Connection):
+        """把只读连接放回连接池，池已满时关闭"""
+        with self._connections_lock:
+            pool = self.db_connections_read.setdefault(config_name, queue.Queue(maxsize=_READ_POOL_SIZE))
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+    
+    @staticmethod
+    def _rollback_quietly(conn: sqlite3.Connection):
+        """出错后回滚未完成的事务，避免长连接停留在事务中；必须在持有写锁时调用，否则可能回滚其他线程的事务"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            pass
+    
     def close_all_connections(self):
         """关闭所有数据库连接"""
-        for conn in self.db_connections.values():
+        with self._connections_lock:
+            for config_name, conn in self.db_connections.items():
+                try:
+                    # 让SQLite根据本次运行的查询情况更新统计信息
+                    conn.execute('PRAGMA optimize')
+                except Exception as e:
+                    logger.warning(f"优化数据库失败 {config_name}: {e}")
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.error(f"关闭数据库连接失败: {e}")
+            self.db_connections.clear()
+            self._write_locks.clear()
+            
+            for pool in self.db_connections_read.values():
+                while True:
+                    try:
+                        pool.get_nowait().close()
+                    except queue.Empty:
+                        break
+                    except Exception as e:
+                        logger.error(f"关闭只读数据库连接失败: {e}")
+            self.db_connections_read.clear()
+    
+    @staticmethod
+    def _executemany_in_transaction(conn: sqlite3.Connection, sql: str, rows: List[tuple],
+                                    chunk_size: int = _BATCH_CHUNK_SIZE) -> Tuple[int, int]:
+        """
+        分块在显式事务中执行 executemany，每块只提交一次
+        
+        某块出现约束冲突时回滚该块并逐行重试，只跳过出错的行；其他错误回滚当前块后抛出，
+        返回或抛出时连接都不会停留在事务中
+        
+        Returns:
+            Tuple[成功数量, 失败数量]
+        """
+        success_count = 0
+        error_count = 0
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
             try:
-                conn.close()
-            except Exception as e:
-                logger.error(f"关闭数据库连接失败: {e}")
-        self.db_connections.clear()
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    conn.executemany(sql, chunk)
+                    conn.commit()
+                    success_count += len(chunk)
+                except sqlite3.IntegrityError as e:
+                    conn.rollback()
+                    logger.warning(f"批量写入出现约束冲突，改为逐行写入: {e}")
+                    conn.execute('BEGIN IMMEDIATE')
+                    chunk_success = 0
+                    for row in chunk:
+                        try:
+                            conn.execute(sql, row)
+                            chunk_success += 1
+                        except sqlite3.IntegrityError as row_error:
+                            logger.error(f"写入记录失败: {row_error}")
+                            error_count += 1
+                    conn.commit()
+                    success_count += chunk_success
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+        return success_count, error_count
     
     # ===================== 专有名词管理 =====================
     
@@ -167,11 +460,7 @@ class SQLiteTranslationMemory:
             
             current_time = datetime.now().isoformat()
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO terminology 
-                (term, translation, domain, notes, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (term, translation, domain, notes, current_time, current_time))
+            cursor.execute(_SQL_UPSERT_TERMINOLOGY, (term, translation, domain, notes, current_time, current_time))
             
             conn.commit()
             conn.close()
@@ -192,7 +481,10 @@ class SQLiteTranslationMemory:
             where_conditions = []
             params = []
             
-            if search_text:
+            if search_text and self._terminology_fts and _fts_searchable(search_text):
+                where_conditions.append("rowid IN (SELECT rowid FROM terminology_fts WHERE terminology_fts MATCH ?)")
+                params.append(_fts_phrase('{term translation}', search_text))
+            elif search_text:
                 where_conditions.append("(term LIKE ? OR translation LIKE ?)")
                 search_pattern = f"%{search_text}%"
                 params.extend([search_pattern, search_pattern])
@@ -259,46 +551,28 @@ class SQLiteTranslationMemory:
             conn.execute('PRAGMA journal_mode=WAL')
             conn.execute('PRAGMA synchronous=NORMAL')
             
-            cursor = conn.cursor()
             current_time = datetime.now().isoformat()
             
             # 准备批量插入的数据
-            batch_data = []
-            for term_data in terms_data:
-                try:
-                    data_tuple = (
-                        term_data.get('term', ''),
-                        term_data.get('translation', ''),
-                        term_data.get('domain', 'general'),
-                        term_data.get('notes', ''),
-                        current_time,  # created_at
-                        current_time   # updated_at
-                    )
-                    batch_data.append(data_tuple)
-                except Exception as prepare_error:
-                    logger.error(f"准备专有名词数据失败: {str(prepare_error)}")
-                    continue
+            batch_data = [
+                (
+                    term_data.get('term', ''),
+                    term_data.get('translation', ''),
+                    term_data.get('domain', 'general'),
+                    term_data.get('notes', ''),
+                    current_time,  # created_at
+                    current_time   # updated_at
+                )
+                for term_data in terms_data
+            ]
             
-            if batch_data:
-                # 使用 executemany 进行批量插入/更新
-                cursor.executemany('''
-                    INSERT OR REPLACE INTO terminology 
-                    (term, translation, domain, notes, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', batch_data)
-                
-                success_count = len(batch_data)
-                error_count = len(terms_data) - success_count
-                
-                conn.commit()
-                conn.close()
-                
-                logger.info(f"批量添加专有名词完成: 成功 {success_count}, 失败 {error_count}")
-                return success_count, error_count
-            else:
-                conn.close()
-                return 0, len(terms_data)
-                
+            # 在显式事务中批量插入/更新
+            success_count, error_count = self._executemany_in_transaction(conn, _SQL_UPSERT_TERMINOLOGY, batch_data)
+            conn.close()
+            
+            logger.info(f"批量添加专有名词完成: 成功 {success_count}, 失败 {error_count}")
+            return success_count, error_count
+        
         except Exception as e:
             logger.error(f"批量添加专有名词失败: {e}")
             return 0, len(terms_data)
@@ -307,229 +581,171 @@ class SQLiteTranslationMemory:
     
     def add_translation(self, config_name: str, translation_obj: TranslationObject, db = None) -> bool:
         """添加翻译记录"""
-        conn = None
-        if db:
-            conn = db
-        else:
-            conn = self.get_translation_connection(config_name)
+        conn = db if db else self.get_translation_connection(config_name)
         
         try:
-            cursor = conn.cursor()
-            
-            current_time = datetime.now().isoformat()
-            translation_dict = translation_obj.to_dict()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO translations 
-                (translation_key, file_name, original_text, process_text, translation, context,
-                 dangerous, is_translated, is_suggested_to_translate, llm_reason, approved, 
-                 approved_text, config_name, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                translation_dict.get('translation_key', ''),
-                translation_dict.get('file_name', ''),
-                translation_dict.get('original_text', ''),
-                translation_dict.get('process_text', ''),
-                translation_dict.get('translation', ''),
-                translation_dict.get('context', ''),
-                translation_dict.get('dangerous', False),
-                translation_dict.get('is_translated', False),
-                translation_dict.get('is_suggested_to_translate', True),
-                translation_dict.get('llm_reason', ''),
-                translation_dict.get('approved', False),
-                translation_dict.get('approved_text', ''),
-                config_name,
-                current_time,
-                current_time
-            ))
+            params = _translation_row(translation_obj, translation_obj.translation_key, config_name,
+                                      datetime.now().isoformat())
             
-            conn.commit()
-            if not db:
-                conn.close()
+            with self._get_write_lock(config_name):
+                try:
+                    conn.execute(_SQL_UPSERT_TRANSLATION, params)
+                except Exception:
+                    self._rollback_quietly(conn)
+                    raise
             return True
         except Exception as e:
             logger.error(f"添加翻译记录失败: {e}")
-            try:
-                if not db:
-                    conn.close()
-            except:
-                pass
             return False
     
     def update_translation(self, config_name: str, translation_key: str, translation_obj: TranslationObject) -> bool:
         """更新翻译记录，如果不存在则插入新的"""
-        conn = None
+        conn = self.get_translation_connection(config_name)
         try:
-            conn = self.get_translation_connection(config_name)
-            cursor = conn.cursor()
-            
-            current_time = datetime.now().isoformat()
-            translation_dict = translation_obj.to_dict()
+            params = _translation_row(translation_obj, translation_key, config_name, datetime.now().isoformat())
             
-            # 使用 INSERT OR REPLACE 直接插入或更新记录
-            cursor.execute('''
-                INSERT OR REPLACE INTO translations 
-                (translation_key, file_name, original_text, process_text, translation, context,
-                 dangerous, is_translated, is_suggested_to_translate, llm_reason, approved, 
-                 approved_text, config_name, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 
-                        COALESCE((SELECT created_at FROM translations WHERE translation_key = ?), ?), ?)
-            ''', (
-                translation_key,
-                translation_dict.get('file_name', ''),
-                translation_dict.get('original_text', ''),
-                translation_dict.get('process_text', ''),
-                translation_dict.get('translation', ''),
-                translation_dict.get('context', ''),
-                translation_dict.get('dangerous', False),
-                translation_dict.get('is_translated', False),
-                translation_dict.get('is_suggested_to_translate', True),
-                translation_dict.get('llm_reason', ''),
-                translation_dict.get('approved', False),
-                translation_dict.get('approved_text', ''),
-                translation_dict.get('config_name', config_name),
-                translation_key,  # 用于 COALESCE 查询
-                current_time,     # 如果是新记录，创建时间
-                current_time      # 更新时间
-            ))
-            
-            conn.commit()
-            conn.close()
+            # 使用 UPSERT 直接插入或更新记录
+            with self._get_write_lock(config_name):
+                try:
+                    conn.execute(_SQL_UPSERT_TRANSLATION, params)
+                except Exception:
+                    self._rollback_quietly(conn)
+                    raise
             return True
         except Exception as e:
             logger.error(f"更新/插入翻译记录失败: {e}")
-            if conn:
-                try:
-                    conn.close()
-                except:
-                    pass
             return False
     
     def get_translation_by_key(self, config_name: str, translation_key: str, db = None) -> Optional[TranslationObject]:
         """根据translation_key获取翻译记录"""
-        conn = None
-        # 如果有外部传入的数据库连接, 则使用外部的
-        if db:
-            conn = db
-        else:
-            conn = self.get_translation_connection(config_name)
+        # 如果有外部传入的数据库连接, 则使用外部的, 否则使用只读连接
+        conn = db if db else self._acquire_read_connection(config_name)
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM translations WHERE translation_key = ?", (translation_key,))
-            row = cursor.fetchone()
-            
-            if row:
-                result = TranslationObject(
-                    file_name=row['file_name'],
-                    original_text=row['original_text'],
-                    process_text=row['process_text'],
-                    translation=row['translation'],
-                    context=row['context'],
-                    dangerous=row['dangerous'],
-                    is_translated=row['is_translated'],
-                    is_suggested_to_translate=row['is_suggested_to_translate'],
-                    llm_reason=row['llm_reason'],
-                    translation_key=row['translation_key'],
-                    approved=row['approved'],
-                    approved_text=row['approved_text']
-                )
-                if not db:
-                    conn.close()
-                return result
-            if not db:
-                conn.close()
-            return None
+            row = _tuple_cursor(conn).execute(_SQL_SELECT_TRANSLATION_BY_KEY, (translation_key,)).fetchone()
+            return TranslationObject(*row) if row else None
         except Exception as e:
             logger.error(f"获取翻译记录失败: {e}")
-            if conn:
-                try:
-                    if not db:
-                        conn.close()
-                except:
-                    pass
             return None
+        finally:
+            if not db:
+                self._release_read_connection(config_name, conn)
     
     def get_translation_by_original_text(self, config_name: str, original_text: str, db = None) -> Optional[TranslationObject]:
         """根据原文精确查询翻译记录"""
-        conn = None
-        if db:
-            conn = db
-        else:
-            conn = self.get_translation_connection(config_name)
+        conn = db if db else self._acquire_read_connection(config_name)
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM translations WHERE original_text = ? LIMIT 1", (original_text,))
-            row = cursor.fetchone()
-            
-            if row:
-                result = TranslationObject(
-                    file_name=row['file_name'],
-                    original_text=row['original_text'],
-                    process_text=row['process_text'],
-                    translation=row['translation'],
-                    context=row['context'],
-                    dangerous=row['dangerous'],
-                    is_translated=row['is_translated'],
-                    is_suggested_to_translate=row['is_suggested_to_translate'],
-                    llm_reason=row['llm_reason'],
-                    translation_key=row['translation_key'],
-                    approved=row['approved'],
-                    approved_text=row['approved_text']
-                )
-                if not db:
-                    conn.close()
-                return result
-            if not db:
-                conn.close()
-            return None
+            row = _tuple_cursor(conn).execute(_SQL_SELECT_TRANSLATION_BY_ORIGINAL, (original_text,)).fetchone()
+            return TranslationObject(*row) if row else None
         except Exception as e:
             logger.error(f"根据原文获取翻译记录失败: {e}")
-            if conn:
+            return None
+        finally:
+            if not db:
+                self._release_read_connection(config_name, conn)
+    
+    def get_translations_by_keys(self, config_name: str, translation_keys: List[str]) -> Dict[str, TranslationObject]:
+        """根据多个translation_key一次性获取翻译记录
+        
+        Returns:
+            Dict[translation_key, TranslationObject]，不存在的键不会出现在结果中
+        """
+        if not translation_keys:
+            return {}
+        
+        conn = self._acquire_read_connection(config_name)
+        try:
+            cursor = _tuple_cursor(conn)
+            results = {}
+            for start in range(0, len(translation_keys), _IN_CHUNK_SIZE):
+                chunk = translation_keys[start:start + _IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"SELECT {_TRANSLATION_OBJECT_COLUMNS} FROM translations WHERE translation_key IN ({placeholders})", chunk)
+                for row in cursor.fetchall():
+                    obj = TranslationObject(*row)
+                    results[obj.translation_key] = obj
+            return results
+        except Exception as e:
+            logger.error(f"批量获取翻译记录失败: {e}")
+            return {}
+        finally:
+            self._release_read_connection(config_name, conn)
+    
+    def get_original_texts_by_keys(self, config_name: str, translation_keys: List[str]) -> Dict[str, str]:
+        """根据多个translation_key获取对应原文，只读取两列，用于判断原文是否变化
+        
+        Returns:
+            Dict[translation_key, original_text]，不存在的键不会出现在结果中
+        """
+        if not translation_keys:
+            return {}
+        
+        conn = self._acquire_read_connection(config_name)
+        try:
+            results = {}
+            for start in range(0, len(translation_keys), _IN_CHUNK_SIZE):
+                chunk = translation_keys[start:start + _IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT translation_key, original_text FROM translations WHERE translation_key IN ({placeholders})",
+                    chunk
+                )
+                results.update(rows)
+            return results
+        except Exception as e:
+            logger.error(f"批量获取原文失败: {e}")
+            return {}
+        finally:
+            self._release_read_connection(config_name, conn)
+    
+    def iter_translations(self, config_name: str, batch_size: int = _BATCH_CHUNK_SIZE) -> Iterator[List[TranslationObject]]:
+        """流式遍历全部翻译记录，每次产出 batch_size 条，内存占用与表大小无关"""
+        # 遍历期间语句一直处于打开状态，使用只读连接，不占用共享的写连接
+        conn = self._acquire_read_connection(config_name)
+        cursor = None
+        try:
+            cursor = _tuple_cursor(conn)
+            cursor.execute(f"SELECT {_TRANSLATION_OBJECT_COLUMNS} FROM translations")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [TranslationObject(*row) for row in rows]
+        except Exception as e:
+            logger.error(f"遍历翻译记录失败: {e}")
+        finally:
+            # 先关闭游标结束语句，再把连接放回连接池
+            if cursor is not None:
                 try:
-                    if not db:
-                        conn.close()
+                    cursor.close()
                 except:
                     pass
-            return None
+            self._release_read_connection(config_name, conn)
     
     def search_translations(self, config_name: str, search_params: Dict) -> List[Dict]:
         """搜索翻译记录"""
-        conn = None
+        conn = self._acquire_read_connection(config_name)
         try:
-            conn = self.get_translation_connection(config_name)
             cursor = conn.cursor()
             
-            # 设置查询超时（SQLite 查询级别）
-            cursor.execute('PRAGMA busy_timeout = 3000')  # 3秒超时
-            
             # 构建查询条件
             where_conditions = []
             params = []
             
-            # 文件名模糊匹配
-            if search_params.get('file_name'):
-                where_conditions.append("file_name LIKE ?")
-                params.append(f"%{search_params['file_name']}%")
-            
-            # 原文模糊匹配
-            if search_params.get('original_text'):
-                where_conditions.append("original_text LIKE ?")
-                params.append(f"%{search_params['original_text']}%")
-            
-            # 译文模糊匹配
-            if search_params.get('translation'):
-                where_conditions.append("translation LIKE ?")
-                params.append(f"%{search_params['translation']}%")
-            
-            # 审核文本模糊匹配
-            if search_params.get('approved_text'):
-                where_conditions.append("approved_text LIKE ?")
-                params.append(f"%{search_params['approved_text']}%")
-            
-            # 上下文模糊匹配
-            if search_params.get('context'):
-                where_conditions.append("context LIKE ?")
-                params.append(f"%{search_params['context']}%")
+            # 文件名、原文、译文、审核文本、上下文模糊匹配，能走全文索引的合并成一次 MATCH 查询
+            use_fts = config_name in self._fts_configs
+            fts_terms = []
+            for column in _TRANSLATION_FTS_COLUMNS:
+                value = search_params.get(column)
+                if not value:
+                    continue
+                if use_fts and _fts_searchable(value):
+                    fts_terms.append(_fts_phrase(column, value))
+                else:
+                    where_conditions.append(f"{column} LIKE ?")
+                    params.append(f"%{value}%")
+            if fts_terms:
+                where_conditions.append("rowid IN (SELECT rowid FROM translations_fts WHERE translations_fts MATCH ?)")
+                params.append(' AND '.join(fts_terms))
             
             # 审核状态精确匹配
             if 'approved' in search_params and search_params['approved'] is not None:
@@ -576,35 +792,26 @@ class SQLiteTranslationMemory:
                     'translation_obj': translation_obj
                 })
             
-            conn.close()
             return result
         except Exception as e:
             logger.error(f"搜索翻译记录失败: {e}")
-            if conn:
-                try:
-                    conn.close()
-                except:
-                    pass
             return []
+        finally:
+            self._release_read_connection(config_name, conn)
     
     def delete_translation(self, config_name: str, translation_key: str) -> bool:
         """删除翻译记录"""
-        conn = None
+        conn = self.get_translation_connection(config_name)
         try:
-            conn = self.get_translation_connection(config_name)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM translations WHERE translation_key = ?", (translation_key,))
-            conn.commit()
-            result = cursor.rowcount > 0
-            conn.close()
-            return result
+            with self._get_write_lock(config_name):
+                try:
+                    cursor = conn.execute("DELETE FROM translations WHERE translation_key = ?", (translation_key,))
+                except Exception:
+                    self._rollback_quietly(conn)
+                    raise
+            return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"删除翻译记录失败: {e}")
-            if conn:
-                try:
-                    conn.close()
-                except:
-                    pass
             return False
     
     def delete_translation_batch(self, config_name: str, translation_keys: List[str]) -> Tuple[int, int]:
@@ -620,50 +827,47 @@ class SQLiteTranslationMemory:
         if not translation_keys:
             return 0, 0
         
-        conn = None
+        conn = self.get_translation_connection(config_name)
         try:
-            conn = self.get_translation_connection(config_name)
             cursor = conn.cursor()
             
-            # 使用 IN 操作进行批量删除
-            placeholders = ','.join(['?' for _ in translation_keys])
-            query = f"DELETE FROM translations WHERE translation_key IN ({placeholders})"
-            cursor.execute(query, translation_keys)
-            conn.commit()
+            # 分块使用 IN 操作批量删除，避免超出 SQLite 参数数量上限；所有块在同一事务中提交
+            success_count = 0
+            with self._get_write_lock(config_name):
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    for start in range(0, len(translation_keys), _IN_CHUNK_SIZE):
+                        chunk = translation_keys[start:start + _IN_CHUNK_SIZE]
+                        placeholders = ','.join('?' * len(chunk))
+                        query = f"DELETE FROM translations WHERE translation_key IN ({placeholders})"
+                        cursor.execute(query, chunk)
+                        success_count += cursor.rowcount
+                    conn.commit()
+                except Exception:
+                    self._rollback_quietly(conn)
+                    raise
             
-            success_count = cursor.rowcount
             error_count = len(translation_keys) - success_count
-            conn.close()
             return success_count, error_count
             
         except Exception as e:
             logger.error(f"批量删除翻译记录失败: {e}")
-            if conn:
-                try:
-                    conn.close()
-                except:
-                    pass
             return 0, len(translation_keys)
     
     def get_translation_count(self, config_name: str) -> int:
         """获取翻译记录总数"""
-        conn = None
+        conn = self._acquire_read_connection(config_name)
         try:
-            conn = self.get_translation_connection(config_name)
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) as count FROM translations")
             row = cursor.fetchone()
             result = row['count'] if row else 0
-            conn.close()
             return result
         except Exception as e:
             logger.error(f"获取翻译记录总数失败: {e}")
-            if conn:
-                try:
-                    conn.close()
-                except:
-                    pass
             return 0
+        finally:
+            self._release_read_connection(config_name, conn)
     
     def update_translation_batch(self, config_name: str, translation_objects: List[TranslationObject]) -> Tuple[int, int]:
         """批量更新或插入翻译记录
@@ -678,70 +882,25 @@ class SQLiteTranslationMemory:
         if not translation_objects:
             return 0, 0
         
-        conn = None
+        conn = self.get_translation_connection(config_name)
         try:
-            conn = self.get_translation_connection(config_name)
-            cursor = conn.cursor()
-            
             current_time = datetime.now().isoformat()
-            success_count = 0
-            error_count = 0
             
-            # 准备批量插入的数据
-            batch_data = []
-            for translation_obj in translation_objects:
-                try:
-                    translation_dict = translation_obj.to_dict()
-                    
-                    # 为每条记录准备数据元组
-                    data_tuple = (
-                        translation_dict.get('translation_key', ''),
-                        translation_dict.get('file_name', ''),
-                        translation_dict.get('original_text', ''),
-                        translation_dict.get('process_text', ''),
-                        translation_dict.get('translation', ''),
-                        translation_dict.get('context', ''),
-                        translation_dict.get('dangerous', False),
-                        translation_dict.get('is_translated', False),
-                        translation_dict.get('is_suggested_to_translate', True),
-                        translation_dict.get('llm_reason', ''),
-                        translation_dict.get('approved', False),
-                        translation_dict.get('approved_text', ''),
-                        config_name,
-                        translation_dict.get('translation_key', ''),  # 用于 COALESCE 查询
-                        current_time,     # 如果是新记录，创建时间
-                        current_time      # 更新时间
-                    )
-                    batch_data.append(data_tuple)
-                    
-                except Exception as prepare_error:
-                    logger.error(f"准备批量数据失败: {str(prepare_error)}")
-                    error_count += 1
-                    continue
+            batch_data = [_translation_row(obj, obj.translation_key, config_name, current_time)
+                          for obj in translation_objects]
             
-            if batch_data:
-                # 使用 executemany 进行批量插入/更新
-                cursor.executemany('''
-                    INSERT OR REPLACE INTO translations 
-                    (translation_key, file_name, original_text, process_text, translation, context,
-                     dangerous, is_translated, is_suggested_to_translate, llm_reason, approved, 
-                     approved_text, config_name, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 
-                            COALESCE((SELECT created_at FROM translations WHERE translation_key = ?), ?), ?)
-                ''', batch_data)
-                
-                success_count = len(batch_data)
-                conn.commit()
-                logger.info(f"批量更新/插入完成: 成功 {success_count}, 失败 {error_count}")
+            # 在显式事务中分块 executemany，每块只提交一次
+            with self._get_write_lock(config_name):
+                try:
+                    success_count, error_count = self._executemany_in_transaction(conn, _SQL_UPSERT_TRANSLATION, batch_data)
+                except Exception:
+                    self._rollback_quietly(conn)
+                    raise
+            logger.info(f"批量更新/插入完成: 成功 {success_count}, 失败 {error_count}")
             
-            conn.close()
             return success_count, error_count
+        
             
         except Exception as e:
             logger.error(f"批量更新/插入翻译记录失败: {e}")
-            if conn:
-                try:
-                    conn.close()
-                except:
-                    pass
             return 0, len(translation_objects)
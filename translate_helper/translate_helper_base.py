@@ -24,6 +24,13 @@ import logging
 from translation_object import TranslationObject
 
 
+# 用户提示词中固定不变的结尾部分，只拼接一次
+_USER_PROMPT_SUFFIX = "\n".join([
+    "",
+    "请直接输出翻译结果的JSON格式：",
+    '{"translation": "翻译后的中文文本", "should_translate": true/false, "reason": "翻译建议的理由"}',
+])
+
 
 class TranslateHelper(object):
     """
@@ -224,9 +231,7 @@ class TranslateHelper(object):
         
         # 添加要翻译的文本
         user_prompt_parts.append(f"需要翻译的文本: {translation_obj.process_text if translation_obj.process_text else translation_obj.original_text}")
-        user_prompt_parts.append("")
-        user_prompt_parts.append("请直接输出翻译结果的JSON格式：")
-        user_prompt_parts.append('{"translation": "翻译后的中文文本", "should_translate": true/false, "reason": "翻译建议的理由"}')
+        user_prompt_parts.append(_USER_PROMPT_SUFFIX)
         
         return "\n".join(user_prompt_parts)
     
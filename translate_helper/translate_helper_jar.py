@@ -28,6 +28,18 @@ from .translate_helper_base import TranslateHelper
 from translation_object import TranslationObject
 
 
+# JAR 字符串提示词中固定不变的注意事项，只拼接一次
+_JAR_PROMPT_NOTICE = "\n".join([
+    "【特别注意】",
+    "- 这是从Java代码中提取的字符串",
+    "- 如果是错误消息、用户提示、界面文本，应该翻译",
+    "- 如果是类名、变量名、配置键名、文件路径等，不应该翻译",
+    "- 如果是日志输出、调试信息，不应该翻译",
+    "- 你还需要根据【调用该文本的函数】进行推测, 这个文本是不是属于字符串类变量或者枚举类型, 比如字典的key, 这类文本也不应该翻译",
+    "",
+])
+
+
 class JARTranslateHelper(TranslateHelper):
     """
     JAR文件翻译助手
@@ -176,13 +188,7 @@ class JARTranslateHelper(TranslateHelper):
         user_prompt_parts.append("")
         
         # 添加特殊提示
-        user_prompt_parts.append("【特别注意】")
-        user_prompt_parts.append("- 这是从Java代码中提取的字符串")
-        user_prompt_parts.append("- 如果是错误消息、用户提示、界面文本，应该翻译")
-        user_prompt_parts.append("- 如果是类名、变量名、配置键名、文件路径等，不应该翻译")
-        user_prompt_parts.append("- 如果是日志输出、调试信息，不应该翻译")
-        user_prompt_parts.append("- 你还需要根据【调用该文本的函数】进行推测, 这个文本是不是属于字符串类变量或者枚举类型, 比如字典的key, 这类文本也不应该翻译")
-        user_prompt_parts.append("")
+        user_prompt_parts.append(_JAR_PROMPT_NOTICE)
         
         # 调用父类方法添加其他信息
         parent_prompt = super().get_llm_user_prompt(translation_obj, similar_translations, found_terms)
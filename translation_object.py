@@ -20,7 +20,7 @@ from dataclasses import dataclass, asdict
 import json
 from typing import Any, Dict
 
-@dataclass
+@dataclass(slots=True)
 class TranslationObject:
     file_name: str
     original_text: str
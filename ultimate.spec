@@ -16,103 +16,39 @@ a = Analysis(
         ('models', 'models'),
     ],
     hiddenimports=[
-        'flask',
-        'werkzeug',
-        'jinja2',
-        'click',
-        'itsdangerous',
-        'markupsafe',
-        'openai',
-        'anthropic',
-        'requests',
-        'urllib3',
-        'certifi',
-        'charset_normalizer',
-        'idna',
-        'argparse',
-        'logging',
-        'json',
-        'os',
-        'sys',
-        'threading',
-        'queue',
-        'time',
-        'datetime',
-        'hashlib',
-        'uuid',
-        'subprocess',
-        'tempfile',
-        'shutil',
-        'zipfile',
-        're',
-        # ChromaDB相关依赖
+        'api.config_api',
+        'api.memory_api',
+        'api.progress_api',
+        'api.review_api',
+        'api.terminology_api',
+        'api.translation_api',
         'chromadb',
         'chromadb.api',
         'chromadb.config',
         'chromadb.db',
         'chromadb.db.impl',
-        'chromadb.db.impl.sqlite',
         'chromadb.db.impl.grpc',
-        'chromadb.utils',
+        'chromadb.db.impl.sqlite',
         'chromadb.telemetry',
-        'sqlite3',
+        'chromadb.utils',
+        'config_manager',
         'duckdb',
+        'global_values',
+        'improved_translator',
+        'model_manager',
         'onnxruntime',
         'overrides',
         'posthog',
+        'progress_manager',
         'pulsar_client',
         'pydantic',
-        'typing_extensions',
-        # C扩展模块 - 提高ChromaDB性能
-        '_testbuffer',
-        '_testcapi',
-        '_testimportmultiple',
-        '_testinternalcapi',
-        '_testmultiphase',
-        'array',
-        '_array',
-        'cmath',
-        'math',
-        '_datetime',
-        '_decimal',
-        '_heapq',
-        '_bisect',
-        '_random',
-        '_operator',
-        '_collections',
-        '_functools',
-        '_pickle',
-        '_json',
-        '_struct',
-        '_csv',
-        '_sqlite3',
-        '_lzma',
-        '_bz2',
-        'zlib',
-        '_hashlib',
-        '_md5',
-        '_sha1',
-        '_sha256',
-        '_sha512',
-        '_blake2',
-        '_sha3',
-        'api.config_api',
-        'api.translation_api', 
-        'api.progress_api',
-        'api.terminology_api',
-        'api.review_api',
-        'api.memory_api',
         'translate_helper.translate_helper_base',
         'translate_helper.translate_helper_csv',
         'translate_helper.translate_helper_jar',
         'translate_helper.translate_helper_json',
-        'config_manager',
-        'global_values',
-        'improved_translator',
-        'progress_manager',
         'translation_object',
+        'typing_extensions',
         'vector_translation_memory',
-        'model_manager',
     ],
     hookspath=['.'],
     runtime_hooks=[],
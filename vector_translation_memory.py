@@ -35,10 +35,59 @@ import chromadb
 from chromadb.config import Settings
 import ahocorasick
 import logging
+import threading
+from functools import lru_cache
 from translation_object import TranslationObject
 
 logger = logging.getLogger(__name__)
 
+# 超过该长度的文本不进入转义缓存，避免缓存占用过多内存
+_ESCAPE_CACHE_MAX_LEN = 2048
+
+
+# 新建集合时的 HNSW 索引参数：更大的 M 和 construction_ef 提高图质量，
+# search_ef 不低于单次查询的结果数（专有名词查询 n_results=20），在大规模翻译记忆下保持召回率
+_COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
+
+# 按优先级尝试的硬件加速执行提供程序
+_ACCELERATED_PROVIDERS = ("CUDAExecutionProvider", "DmlExecutionProvider")
+
+
+def _create_embedding_function():
+    """
+    创建与 ChromaDB 默认模型一致（all-MiniLM-L6-v2 ONNX）的嵌入函数，
+    优先使用 GPU / DirectML 执行提供程序；没有可用加速时返回 None，沿用默认嵌入函数
+    """
+    try:
+        import onnxruntime
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+    except ImportError:
+        return None
+    
+    available = onnxruntime.get_available_providers()
+    providers = [provider for provider in _ACCELERATED_PROVIDERS if provider in available]
+    if not providers:
+        return None
+    
+    try:
+        embedding_function = ONNXMiniLM_L6_V2(preferred_providers=providers + ["CPUExecutionProvider"])
+        logger.info(f"向量嵌入使用执行提供程序: {providers[0]}")
+        return embedding_function
+    except Exception as e:
+        logger.warning(f"创建加速嵌入函数失败，使用默认嵌入函数: {e}")
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _escape_text_cached(text: str) -> str:
+    """去除文本中的引号（带缓存），相似翻译检查会反复转义同一批原文"""
+    return text.replace("'", "").replace('"', '')
+
 
 class VectorTranslationMemory:
     """基于向量数据库的翻译记忆库"""
@@ -68,11 +117,15 @@ class VectorTranslationMemory:
                 )
             )
         
+        # 嵌入函数（同一模型，仅切换执行提供程序，已有向量无需重建）
+        self._embedding_function = _create_embedding_function()
+        
         # 专有名词库（全局共享）
         self.terminology_collection = self._get_or_create_collection("terminology")
         
         # 翻译历史库字典（按模组配置区分）
         self.translation_collections = {}
+        self._collections_lock = threading.Lock()
         
         # 初始化 Aho-Corasick 自动机用于快速专有名词匹配
         self.terminology_automaton = None
@@ -82,12 +135,17 @@ class VectorTranslationMemory:
     
     def _get_or_create_collection(self, collection_name: str):
         """获取或创建集合"""
+        # 未指定时不传 embedding_function，否则 ChromaDB 会把 None 当作不做嵌入
+        extra_args = {}
+        if self._embedding_function is not None:
+            extra_args["embedding_function"] = self._embedding_function
         try:
-            return self.client.get_collection(collection_name)
+            return self.client.get_collection(collection_name, **extra_args)
         except Exception:
             return self.client.create_collection(
                 name=collection_name,
-                metadata={"hnsw:space": "cosine"}
+                metadata=_COLLECTION_METADATA,
+                **extra_args
             )
     
     def _init_terminology_automaton(self):
@@ -141,11 +199,16 @@ class VectorTranslationMemory:
             logger.error(f"从自动机移除术语失败: {e}")
     
     def get_translation_collection(self, config_name: str):
-        """获取特定配置的翻译历史库"""
-        if config_name not in self.translation_collections:
-            collection_name = f"translations_{config_name}"
-            self.translation_collections[config_name] = self._get_or_create_collection(collection_name)
-        return self.translation_collections[config_name]
+        """获取特定配置的翻译历史库（集合句柄按配置缓存，只在首次访问时查询 ChromaDB）"""
+        collection = self.translation_collections.get(config_name)
+        if collection is None:
+            # 加锁避免多个线程同时首次访问时重复创建集合
+            with self._collections_lock:
+                collection = self.translation_collections.get(config_name)
+                if collection is None:
+                    collection = self._get_or_create_collection(f"translations_{config_name}")
+                    self.translation_collections[config_name] = collection
+        return collection
     
     def add_terminology(self, term: str, translation: str, domain: str = "", notes: str = "") -> bool:
         """添加专有名词到向量数据库"""
@@ -270,29 +333,47 @@ class VectorTranslationMemory:
     
     def search_terminology(self, text: str, threshold: float = 0.8) -> List[Dict]:
         """搜索文本中包含的专有名词"""
-        found_terms = []
+        return self.search_terminology_batch([text], threshold)[0]
+    
+    def search_terminology_batch(self, texts: List[str], threshold: float = 0.8) -> List[List[Dict]]:
+        """批量搜索多段文本中包含的专有名词，所有语义搜索合并为一次向量查询
+        
+        Returns:
+            与 texts 一一对应的专有名词列表
+        """
+        results = [[] for _ in texts]
+        # 语义搜索请求：(所属文本下标, 查询文本, 阈值, 匹配片段或None)
+        queries = []
         try:
-            text = self.escape_text(text)
-            
-            # 策略1: 精确匹配 - 检查专有名词是否直接出现在文本中
-            exact_matches = self._find_exact_terminology_matches(text)
-            found_terms.extend(exact_matches)
-            
-            # 策略2: 分段搜索 - 将长文本分解为更小的片段进行语义搜索
-            if len(text) > 10:  # 对于较长的文本使用分段搜索
-                semantic_matches = self._find_terminology_by_segments(text, threshold)
-                found_terms.extend(semantic_matches)
-            else:
-                # 策略3: 整体语义搜索 - 对于较短的文本直接搜索
-                semantic_matches = self._find_terminology_by_semantic_search(text, threshold)
-                found_terms.extend(semantic_matches)
+            for index, text in enumerate(texts):
+                text = self.escape_text(text)
+                
+                # 策略1: 精确匹配 - 检查专有名词是否直接出现在文本中
+                results[index].extend(self._find_exact_terminology_matches(text))
+                
+                # 策略2: 分段搜索 - 将长文本分解为更小的片段进行语义搜索
+                if len(text) > 10:  # 对于较长的文本使用分段搜索
+                    for segment in self._split_text_into_segments(text):
+                        if len(segment.strip()) < 3:  # 跳过过短的片段
+                            continue
+                        queries.append((index, segment, threshold * 0.8, segment))  # 稍微降低阈值
+                else:
+                    # 策略3: 整体语义搜索 - 对于较短的文本直接搜索
+                    queries.append((index, text, threshold, None))
             
-            # 去重和排序
-            found_terms = self._deduplicate_and_sort_terms(found_terms)
+            semantic_results = self._query_terminology_semantic([(query[1], query[2]) for query in queries])
+            for (index, _, _, segment), matches in zip(queries, semantic_results):
+                if segment is not None:
+                    for match in matches:
+                        match['match_type'] = 'segment'
+                        match['matched_segment'] = segment
+                results[index].extend(matches)
             
         except Exception as e:
             logger.error(f"搜索专有名词失败: {e}")
-        return found_terms
+        
+        # 去重和排序
+        return [self._deduplicate_and_sort_terms(found_terms) for found_terms in results]
     
     def _find_exact_terminology_matches(self, text: str) -> List[Dict]:
         """精确匹配专有名词 - 使用 Aho-Corasick 自动机优化"""
@@ -359,49 +440,36 @@ class VectorTranslationMemory:
                (not after_char.isalnum() and after_char != '_')
     
     
-    def _find_terminology_by_segments(self, text: str, threshold: float) -> List[Dict]:
-        """通过分段搜索专有名词"""
-        segment_matches = []
-        try:
-            # 将文本分解为更小的片段
-            segments = self._split_text_into_segments(text)
-            
-            for segment in segments:
-                if len(segment.strip()) < 3:  # 跳过过短的片段
-                    continue
-                    
-                # 对每个片段进行语义搜索
-                matches = self._find_terminology_by_semantic_search(segment, threshold * 0.8)  # 稍微降低阈值
-                for match in matches:
-                    match['match_type'] = 'segment'
-                    match['matched_segment'] = segment
-                segment_matches.extend(matches)
-        except Exception as e:
-            logger.error(f"分段搜索专有名词失败: {e}")
-        
-        return segment_matches
-    
     def _find_terminology_by_semantic_search(self, text: str, threshold: float) -> List[Dict]:
         """使用语义搜索查找专有名词"""
-        semantic_matches = []
+        return self._query_terminology_semantic([(text, threshold)])[0]
+    
+    def _query_terminology_semantic(self, queries: List[Tuple[str, float]]) -> List[List[Dict]]:
+        """一次向量查询完成多条 (文本, 阈值) 的专有名词语义搜索"""
+        semantic_matches = [[] for _ in queries]
+        if not queries:
+            return semantic_matches
         try:
             search_results = self.terminology_collection.query(
-                query_texts=[text],
+                query_texts=[text for text, _ in queries],
                 n_results=20  # 增加搜索结果数量
             )
             
             if search_results['distances'] and search_results['metadatas']:
-                for distance, metadata in zip(search_results['distances'][0], search_results['metadatas'][0]):
-                    similarity = 1 - distance
-                    if similarity >= threshold:
-                        semantic_matches.append({
-                            'term': metadata.get('term', ''),
-                            'translation': metadata.get('translation', ''),
-                            'domain': metadata.get('domain', ''),
-                            'notes': metadata.get('notes', ''),
-                            'similarity': similarity,
-                            'match_type': 'semantic'
-                        })
+                for matches, (_, threshold), distances, metadatas in zip(
+                    semantic_matches, queries, search_results['distances'], search_results['metadatas']
+                ):
+                    for distance, metadata in zip(distances, metadatas):
+                        similarity = 1 - distance
+                        if similarity >= threshold:
+                            matches.append({
+                                'term': metadata.get('term', ''),
+                                'translation': metadata.get('translation', ''),
+                                'domain': metadata.get('domain', ''),
+                                'notes': metadata.get('notes', ''),
+                                'similarity': similarity,
+                                'match_type': 'semantic'
+                            })
         except Exception as e:
             logger.error(f"语义搜索专有名词失败: {e}")
         
@@ -488,7 +556,46 @@ class VectorTranslationMemory:
         except Exception as e:
             logger.error(f"添加翻译历史失败: {e}")
             return ""
+    
+    def add_translation_history_batch(self, config_name: str, translation_objects: List[TranslationObject]) -> Tuple[int, int]:
+        """批量添加翻译历史到特定配置的库中，一次 upsert 写入全部记录
+        
+        Args:
+            config_name: 配置名称
+            translation_objects: 翻译对象列表
+        
+        Returns:
+            Tuple[成功数量, 失败数量]
+        """
+        if not translation_objects:
+            return 0, 0
         
+        try:
+            collection = self.get_translation_collection(config_name)
+            created_at = datetime.now().isoformat()
+            
+            # 同一批次内相同 translation_key 只保留最后一次写入
+            records = {}
+            for translation_obj in translation_objects:
+                source_text = self.escape_text(translation_obj.original_text)
+                records[translation_obj.translation_key] = (source_text, {
+                    "original_text": source_text,
+                    "translation_key": translation_obj.translation_key,
+                    "config_name": config_name,
+                    "created_at": created_at,
+                    "type": "translation"
+                })
+            
+            collection.upsert(
+                ids=list(records),
+                documents=[record[0] for record in records.values()],
+                metadatas=[record[1] for record in records.values()]
+            )
+            return len(translation_objects), 0
+        except Exception as e:
+            logger.error(f"批量添加翻译历史失败: {e}")
+            return 0, len(translation_objects)
+    
     def update_history_translation(self, config_name: str, translation_key: str, updated_translation_obj: TranslationObject) -> bool:
         """更新翻译历史记录
         
@@ -616,41 +723,50 @@ class VectorTranslationMemory:
         Returns:
             相似翻译记录列表，返回格式兼容旧版本调用方
         """
+        return self.search_similar_translations_batch(config_name, [source_text], threshold, n_results)[0]
+    
+    def search_similar_translations_batch(self, config_name: str, source_texts: List[str], threshold: float, n_results: int = 3) -> List[List[Dict]]:
+        """批量搜索相似的历史翻译，所有原文在一次向量查询中完成嵌入和检索
+        
+        Returns:
+            与 source_texts 一一对应的相似翻译记录列表
+        """
+        results = [[] for _ in source_texts]
+        if not source_texts:
+            return results
         try:
             collection = self.get_translation_collection(config_name)
-            source_text = self.escape_text(source_text)
             
             try:
                 # 使用语义搜索查找相似的翻译记录
                 search_results = collection.query(
-                    query_texts=[source_text],
+                    query_texts=[self.escape_text(text) for text in source_texts],
                     n_results=n_results
                 )
                 
-                similar_translations = []
                 if search_results['distances'] and search_results['metadatas']:
-                    for distance, metadata in zip(search_results['distances'][0], search_results['metadatas'][0]):
-                        similarity = 1 - distance
-                        if similarity > threshold:  # 相似度阈值
-                            # 返回简化的结果，只包含语义搜索相关信息
-                            similar_translations.append({
-                                'type': 'similar',
-                                'source': metadata.get('original_text', ''),
-                                'similarity': similarity,
-                                'translation_key': metadata.get('translation_key', ''),
-                                'created_at': metadata.get('created_at', '')
-                            })
-                
-                return similar_translations
+                    for similar_translations, distances, metadatas in zip(
+                        results, search_results['distances'], search_results['metadatas']
+                    ):
+                        for distance, metadata in zip(distances, metadatas):
+                            similarity = 1 - distance
+                            if similarity > threshold:  # 相似度阈值
+                                # 返回简化的结果，只包含语义搜索相关信息
+                                similar_translations.append({
+                                    'type': 'similar',
+                                    'source': metadata.get('original_text', ''),
+                                    'similarity': similarity,
+                                    'translation_key': metadata.get('translation_key', ''),
+                                    'created_at': metadata.get('created_at', '')
+                                })
                 
             except Exception as e:
                 logger.error(traceback.format_exc())
                 logger.error(f"语义搜索翻译历史失败: {e}")
             
-            return []
         except Exception as e:
             logger.error(f"搜索相似翻译失败: {e}")
-            return []
+        return results
     
     def efficient_search_translations(self, config_name: str, search_params: Dict) -> List[Dict]:
         """高效搜索翻译记录，结合where_document和metadata精确匹配
@@ -883,15 +999,18 @@ class VectorTranslationMemory:
         if not isinstance(text, str):
             return str(text)
         
-        escaped_text = text.replace("'", "").replace('"', '')
-        return escaped_text
+        if len(text) < _ESCAPE_CACHE_MAX_LEN:
+            return _escape_text_cached(text)
+        return text.replace("'", "").replace('"', '')
     
-    def update_history_translation_batch(self, config_name: str, translation_objects: List[TranslationObject]) -> Tuple[int, int]:
+    def update_history_translation_batch(self, config_name: str, translation_objects: List[TranslationObject],
+                                         only_changed: bool = False) -> Tuple[int, int]:
         """批量更新翻译历史记录
         
         Args:
             config_name: 配置名称
             translation_objects: 要更新的翻译对象列表
+            only_changed: 为 True 时先读取已存储的文档，原文未变化的记录直接沿用已持久化的向量，不再重新嵌入
         
         Returns:
             Tuple[成功数量, 失败数量]
@@ -909,6 +1028,7 @@ class VectorTranslationMemory:
             ids = []
             documents = []
             metadatas = []
+            prepared_objects = []
             
             for translation_obj in translation_objects:
                 try:
@@ -924,17 +1044,34 @@ class VectorTranslationMemory:
                     ids.append(translation_key)
                     documents.append(original_text)
                     metadatas.append({
+                        'original_text': original_text,
                         'translation_key': translation_key,
                         'config_name': config_name,
                         'created_at': datetime.now().isoformat(),
                         'type': 'translation'
                     })
+                    prepared_objects.append(translation_obj)
                     
                 except Exception as prepare_error:
                     logger.error(f"准备批量更新数据失败: {str(prepare_error)}")
                     error_count += 1
                     continue
             
+            if ids and only_changed:
+                try:
+                    # 只读取文档不涉及嵌入计算，原文与已存储文档一致的记录无需重新嵌入
+                    existing = collection.get(ids=ids, include=['documents'])
+                    stored_documents = dict(zip(existing['ids'], existing['documents'] or []))
+                    changed = [i for i, (doc_id, document) in enumerate(zip(ids, documents))
+                               if stored_documents.get(doc_id) != document]
+                    success_count += len(ids) - len(changed)
+                    ids = [ids[i] for i in changed]
+                    documents = [documents[i] for i in changed]
+                    metadatas = [metadatas[i] for i in changed]
+                    prepared_objects = [prepared_objects[i] for i in changed]
+                except Exception as get_error:
+                    logger.warning(f"读取已存储的向量记录失败，全部重新写入: {get_error}")
+            
             if ids:
                 try:
                     # 使用 upsert 进行批量插入/更新
@@ -943,13 +1080,13 @@ class VectorTranslationMemory:
                         documents=documents,
                         metadatas=metadatas
                     )
-                    success_count = len(ids)
-                    logger.info(f"批量更新向量数据库完成: 成功 {success_count} 条记录")
+                    success_count += len(ids)
+                    logger.info(f"批量更新向量数据库完成: 写入 {len(ids)} 条记录")
                     
                 except Exception as upsert_error:
                     logger.error(f"向量数据库批量 upsert 失败: {str(upsert_error)}")
                     # 如果批量操作失败，尝试逐个更新
-                    for i, translation_obj in enumerate(translation_objects[:len(ids)]):
+                    for translation_obj in prepared_objects:
                         try:
                             if self.update_history_translation(config_name, translation_obj.translation_key, translation_obj):
                                 success_count += 1